@@ -1,4 +1,4 @@
-from PIL import Image, ImageEnhance, ImageFilter
+from PIL import Image, ImageEnhance, ImageFilter, ImageStat
 from PIL.Image import Resampling
 from PIL.ExifTags import TAGS
 import tempfile
@@ -9,28 +9,409 @@ from numpy.typing import NDArray
 import random
 import time
 import datetime
+import threading
+import hashlib
+import io
+from collections import Counter, OrderedDict, deque
 from typing import Any
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
+from functools import lru_cache
+from scipy import ndimage
+from scipy.fft import dctn, idctn
+
+try:
+    import cv2
+except ImportError:
+    # OpenCV is optional here; SciPy filters are used without it
+    cv2 = None
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420, TJSAMP_444, TJFLAG_FASTDCT
+except ImportError:
+    # PyTurboJPEG is optional; Pillow's JPEG encoder is used without it
+    TurboJPEG = None
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional; the NumPy/SciPy code paths are used without it
+    njit = None
+
+
+def _stem(path):
+    """Return a path's file name without its last suffix, like Path.stem without building a Path"""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+@lru_cache(maxsize=8)
+def _vignette_mask(height, width, strength):
+    """Return a cached float32 radial falloff mask, 1 at the centre"""
+    Y, X = np.ogrid[:height, :width]
+    center_x, center_y = width // 2, height // 2
+    
+    # Distance from center
+    dist_from_center = np.sqrt(((X - center_x)**2 + (Y - center_y)**2).astype(np.float32))
+    max_dist = np.sqrt(center_x**2 + center_y**2)
+    
+    # Create vignette
+    vignette = 1 - (dist_from_center / max_dist) * strength
+    np.clip(vignette, 0, 1, out=vignette)
+    vignette.flags.writeable = False
+    return vignette
+
+
+@lru_cache(maxsize=8)
+def _fisheye_maps(height, width, strength):
+    """Return cached read-only float32 (map_x, map_y) source coordinates for the fisheye warp"""
+    y, x = np.ogrid[:height, :width]
+    
+    # Center coordinates
+    cx, cy = width // 2, height // 2
+    dx = (x - cx).astype(np.float32)
+    dy = (y - cy).astype(np.float32)
+    max_r = min(cx, cy)
+    
+    # Scaling the offset by r_new / r is the polar round trip without arctan2/cos/sin
+    scale = 1 + np.float32(strength) * ((dx * dx + dy * dy) / np.float32(max_r * max_r))
+    map_x = np.clip(cx + dx * scale, 0, width - 1)
+    map_y = np.clip(cy + dy * scale, 0, height - 1)
+    map_x.flags.writeable = False
+    map_y.flags.writeable = False
+    return map_x, map_y
+
+
+@lru_cache(maxsize=8)
+def _stego_selection(grid_shape):
+    """Return a cached read-only mask of which 8-pixel grid points get their LSB flipped"""
+    # Generate pseudo-random modifications based on pixel positions
+    rng = np.random.default_rng(42)  # Consistent but unpredictable pattern
+    selection = rng.random(grid_shape) > 0.7
+    selection.flags.writeable = False
+    return selection
+
+
+@lru_cache(maxsize=16)
+def _embedding_slots(seed, height, width):
+    """Return a cached read-only mask of the pixels a seeded 1-in-4 pattern selects"""
+    slots = np.random.default_rng(seed).integers(0, 4, (height, width)) == 0
+    slots.flags.writeable = False
+    return slots
+
+
+@lru_cache(maxsize=8)
+def _diagonal_pattern(height, width):
+    """Return a cached read-only float32 (x + y) % 17 stripe pattern"""
+    pattern = ((np.arange(height)[:, np.newaxis] + np.arange(width)[np.newaxis, :]) % 17).astype(np.float32)
+    pattern.flags.writeable = False
+    return pattern
+
+
+@lru_cache(maxsize=8)
+def _blend_table(factor):
+    """Return a cached read-only (grey, level) uint8 table of Image.blend(grey, level, factor)"""
+    # Image.blend's float32 arithmetic and truncation, for every pair at once
+    levels = np.arange(256, dtype=np.float32)
+    blended = levels[:, np.newaxis] + np.float32(factor) * (levels[np.newaxis, :] - levels[:, np.newaxis])
+    table = np.clip(blended.astype(np.int32), 0, 255).astype(np.uint8)
+    table.flags.writeable = False
+    return table
+
+
+_NOISE_POOL_SIZE = 1 << 25  # int8 samples per grain intensity (32 MB); windows up to half of it are drawn from it
+
+
+# At most two pools (64 MB) per process; presets mostly reuse one or two grain intensities
+@lru_cache(maxsize=2)
+def _noise_pool(intensity):
+    """Return a cached read-only pool of uniform int8 grain in [-intensity, intensity]"""
+    # Fresh OS entropy per process, so pools differ between runs and workers
+    pool = np.random.Generator(np.random.Philox()).integers(-intensity, intensity + 1, _NOISE_POOL_SIZE,
+                                                            dtype=np.int8)
+    pool.flags.writeable = False
+    return pool
+
+
+if njit is not None:
+    # nogil rather than parallel: the workqueue threading layer hangs when launched off the
+    # main thread (Streamlit script runner, apply_presets_batch), so batch workers parallelize
+    @njit(nogil=True, cache=True)
+    def _edge_gain_table(edge_divisor, channels):
+        """Precompute (step * edge) // edge_divisor for noise steps -2..2 and every possible edge"""
+        table = np.empty((5, 2 * 255 * channels + 1), dtype=np.int32)
+        for step in range(-2, 3):
+            for edge in range(table.shape[1]):
+                table[step + 2, edge] = (step * edge) // edge_divisor
+        return table
+    
+    @njit(nogil=True, fastmath=True, cache=True)
+    def _edge_weighted_noise(img_array, noise, edge_divisor, out):
+        """Add edge-weighted integer noise to a uint8 image in a single fused pass"""
+        height, width, channels = img_array.shape
+        gain = _edge_gain_table(edge_divisor, channels)
+        for y in range(height):
+            y0 = max(y - 1, 0)
+            for x in range(width):
+                x0 = max(x - 1, 0)
+                # |horizontal| + |vertical| backward difference of the channel sum
+                here = 0
+                left = 0
+                up = 0
+                for c in range(channels):
+                    here += np.int32(img_array[y, x, c])
+                    left += np.int32(img_array[y, x0, c])
+                    up += np.int32(img_array[y0, x, c])
+                edge = abs(here - left) + abs(here - up)
+                for c in range(channels):
+                    step = np.int32(noise[y, x, c])
+                    value = np.int32(img_array[y, x, c]) + step + gain[step + 2, edge]
+                    out[y, x, c] = min(max(value, 0), 255)
+    
+    @njit(nogil=True, cache=True)
+    def _grain_flip_edge_noise(img_array, grain, flip_grid, noise, edge_divisor, out):
+        """Grain, grid LSB flips and edge-weighted noise in one pass over a uint8 image"""
+        height, width, channels = img_array.shape
+        gain = _edge_gain_table(edge_divisor, channels)
+        row = np.empty((width, channels), dtype=np.int32)
+        row_sum = np.empty(width, dtype=np.int32)
+        prev_sum = np.empty(width, dtype=np.int32)
+        for y in range(height):
+            # Grained row exactly as _add_noise_arr followed by _stego_arr would leave it
+            for x in range(width):
+                total = 0
+                for c in range(channels):
+                    value = min(max(np.int32(img_array[y, x, c]) + np.int32(grain[y, x, c]), 0), 255)
+                    row[x, c] = value
+                    total += value
+                row_sum[x] = total
+            if y % 8 == 0:
+                for x in range(0, width, 8):
+                    if flip_grid[y // 8, x // 8]:
+                        total = 0
+                        for c in range(channels):
+                            row[x, c] ^= 1
+                            total += row[x, c]
+                        row_sum[x] = total
+            if y == 0:
+                prev_sum[:] = row_sum
+            
+            # Same gradient and weighting as _edge_weighted_noise, on the grained rows
+            for x in range(width):
+                edge = abs(row_sum[x] - row_sum[max(x - 1, 0)]) + abs(row_sum[x] - prev_sum[x])
+                for c in range(channels):
+                    step = np.int32(noise[y, x, c])
+                    value = row[x, c] + step + gain[step + 2, edge]
+                    out[y, x, c] = min(max(value, 0), 255)
+            prev_sum[:] = row_sum
+    
+    @njit(nogil=True, cache=True)
+    def _sepia_grain(img_array, sepia_tables, intensity, seed, out):
+        """Sepia tone plus uniform grain in one pass; returns the sum of PIL 'L' grey levels of out"""
+        height, width = img_array.shape[0], img_array.shape[1]
+        span = np.uint64(2 * intensity + 1)
+        sample_bits = np.uint64(21)
+        sample_mask = np.uint64(0x1FFFFF)
+        state = np.uint64(seed)
+        grey_total = 0
+        for y in range(height):
+            for x in range(width):
+                r = img_array[y, x, 0]
+                g = img_array[y, x, 1]
+                b = img_array[y, x, 2]
+                
+                # Saturate the tone first, as the uint8 sepia image would; 16.16 fixed-point tables, no floats
+                red = min((sepia_tables[0, r] + sepia_tables[1, g] + sepia_tables[2, b] + 0x8000) >> 16, 255)
+                green = min((sepia_tables[3, r] + sepia_tables[4, g] + sepia_tables[5, b] + 0x8000) >> 16, 255)
+                blue = min((sepia_tables[6, r] + sepia_tables[7, g] + sepia_tables[8, b] + 0x8000) >> 16, 255)
+                
+                # xorshift64*: one draw per pixel, cut into three 21-bit grain samples
+                state ^= state >> np.uint64(12)
+                state ^= state << np.uint64(25)
+                state ^= state >> np.uint64(27)
+                bits = state * np.uint64(2685821657736338717)
+                red += np.int32(((bits & sample_mask) * span) >> sample_bits) - intensity
+                green += np.int32((((bits >> sample_bits) & sample_mask) * span) >> sample_bits) - intensity
+                blue += np.int32((((bits >> np.uint64(42)) & sample_mask) * span) >> sample_bits) - intensity
+                
+                red = min(max(red, 0), 255)
+                green = min(max(green, 0), 255)
+                blue = min(max(blue, 0), 255)
+                out[y, x, 0] = red
+                out[y, x, 1] = green
+                out[y, x, 2] = blue
+                grey_total += (red * 19595 + green * 38470 + blue * 7471 + 0x8000) >> 16
+        return grey_total
+    
+    @njit(nogil=True, cache=True)
+    def _color_grey(img_array, blend_table, out):
+        """ImageEnhance.Color in one pass; returns the sum of PIL 'L' grey levels of out"""
+        height, width = img_array.shape[0], img_array.shape[1]
+        grey_total = 0
+        for y in range(height):
+            for x in range(width):
+                r = img_array[y, x, 0]
+                g = img_array[y, x, 1]
+                b = img_array[y, x, 2]
+                
+                # Each channel blends away from the pixel's own grey level: a (grey, level) table lookup
+                grey = (np.int32(r) * 19595 + np.int32(g) * 38470 + np.int32(b) * 7471 + 0x8000) >> 16
+                red = blend_table[grey, r]
+                green = blend_table[grey, g]
+                blue = blend_table[grey, b]
+                out[y, x, 0] = red
+                out[y, x, 1] = green
+                out[y, x, 2] = blue
+                grey_total += (np.int32(red) * 19595 + np.int32(green) * 38470 + np.int32(blue) * 7471 + 0x8000) >> 16
+        return grey_total
 
 class ImageProcessor:
+    PRESET_VERSION = 1  # Bump when a preset's output changes, so reused outputs are not served across versions
+    
     def __init__(self):
         self.temp_dir = tempfile.gettempdir()
-        self.session_history = []  # Track processing patterns to avoid repetition
         self.max_history = 10      # Remember last 10 processing sessions
+        # Track processing patterns to avoid repetition, as (platform, variation_type, time window)
+        # fingerprints; the counter mirrors the deque so lookups don't scan it
+        self.session_history = deque(maxlen=self.max_history)
+        self._history_counts = Counter()
+        self._rng = np.random.default_rng()  # Shared generator; never touches global NumPy RNG state
+        self._pool = ThreadPoolExecutor(max_workers=os.cpu_count())  # NumPy/PIL/scipy kernels release the GIL
+        self._scratch = threading.local()  # Per-thread reusable work buffers for batch workers
+        self._process_pool = None  # Started on the first process-backed batch
+        self._process_pool_lock = threading.Lock()
+        self._sepia_f32 = np.array([
+            [0.393, 0.769, 0.189],
+            [0.349, 0.686, 0.168],
+            [0.272, 0.534, 0.131]
+        ], dtype=np.float32)
+        self._sepia_f32_t = np.ascontiguousarray(self._sepia_f32.T)  # Right operand for matmul; a strided .T runs ~2x slower
+        # Every sepia coefficient times every input level, 16.16 fixed point: row 3 * out + in
+        self._sepia_tables = np.round(self._sepia_f32.reshape(9, 1).astype(np.float64)
+                                      * np.arange(256) * 65536).astype(np.int32)
+        self._lut_cache = {}  # Affine point-op LUTs keyed by their factors
+        self._tj = self._load_turbojpeg()  # One shared encoder; each encode call uses its own handle
+        # Off by default: a re-upload should get a fresh random variation, not the previous output
+        self.reuse_outputs = False
+        self._output_cache = OrderedDict()  # (content sha256, platform, preset version) -> (output path, mtime), LRU order
+        self._output_cache_lock = threading.Lock()  # apply_presets_batch threads share the cache
+        self.max_cached_outputs = 32
+        self._preset_dispatch = {
+            'tiktok': self._apply_tiktok_advanced_preset,
+            'instagram': self._apply_instagram_advanced_preset,
+            'youtube': self._apply_youtube_advanced_preset,
+            'youtube_shorts': self._apply_youtube_shorts_preset,
+        }
+        
+        # Orthonormal 8x8 DCT-II basis (rows are frequencies): dct = D @ X @ D.T, idct = D.T @ Y @ D
+        k = np.arange(8)
+        self._dct_basis = np.sqrt(2 / 8) * np.cos(np.pi * (2 * k[np.newaxis, :] + 1) * k[:, np.newaxis] / 16)
+        self._dct_basis[0] /= np.sqrt(2)
+        self._dct_basis = self._dct_basis.astype(np.float32)
     
-    def apply_preset(self, input_path, platform):
+    def apply_preset(self, input_path, platform, output_path=None):
         """Apply platform-specific preset with dynamic anti-algorithm variations"""
-        output_path = os.path.join(self.temp_dir, f"processed_{platform}_{Path(input_path).stem}.jpg")
-        
-        if platform == 'tiktok':
-            return self._apply_tiktok_advanced_preset(input_path, output_path)
-        elif platform == 'instagram':
-            return self._apply_instagram_advanced_preset(input_path, output_path)
-        elif platform == 'youtube':
-            return self._apply_youtube_advanced_preset(input_path, output_path)
-        elif platform == 'youtube_shorts':
-            return self._apply_youtube_shorts_preset(input_path, output_path)
-        else:
+        if not self.reuse_outputs:
+            return self._run_preset(input_path, platform, output_path)
+        
+        # Identical content re-requested for the same platform reuses the previous output
+        with open(input_path, 'rb') as f:
+            key = (hashlib.file_digest(f, 'sha256').hexdigest(), platform, self.PRESET_VERSION)
+        
+        with self._output_cache_lock:
+            cached = self._output_cache.get(key)
+            if cached is not None:
+                cached_path, cached_mtime = cached
+                # Outputs are named by stem, so a later input may have overwritten the file
+                if os.path.exists(cached_path) and os.stat(cached_path).st_mtime_ns == cached_mtime:
+                    self._output_cache.move_to_end(key)
+                    return cached_path
+        
+        result = self._run_preset(input_path, platform, output_path)
+        with self._output_cache_lock:
+            self._output_cache[key] = (result, os.stat(result).st_mtime_ns)
+            while len(self._output_cache) > self.max_cached_outputs:
+                self._output_cache.popitem(last=False)
+        return result
+    
+    def _run_preset(self, input_path, platform, output_path=None):
+        """Dispatch to the platform preset pipeline"""
+        preset = self._preset_dispatch.get(platform)
+        if preset is None:
             raise ValueError(f"Unknown platform: {platform}")
+        return preset(input_path, output_path or os.path.join(self.temp_dir, f"processed_{platform}_{_stem(input_path)}.jpg"))
+    
+    def _apply_preset_to_own_file(self, input_path, platform):
+        """Apply a preset, writing to a fresh file in temp_dir rather than the name shared by every input with this stem"""
+        # Batch items run concurrently and may share a file name from different directories
+        fd, output_path = tempfile.mkstemp(suffix='.jpg', dir=self.temp_dir,
+                                           prefix=f"processed_{platform}_{_stem(input_path)}_")
+        os.close(fd)
+        try:
+            result = self.apply_preset(input_path, platform, output_path)
+        except Exception:
+            os.remove(output_path)
+            raise
+        if result != output_path and os.path.exists(output_path):
+            os.remove(output_path)  # A reused output was served from its original file
+        return result
+    
+    def _load_turbojpeg(self):
+        """Return a shared TurboJPEG encoder, or None when the library is unavailable"""
+        if TurboJPEG is None:
+            return None
+        try:
+            return TurboJPEG()
+        except (OSError, RuntimeError) as e:
+            print(f"libturbojpeg not available, using Pillow JPEG encoder: {e}")
+            return None
+    
+    def _save_jpeg(self, img, output_path, quality):
+        """Save a PIL image or RGB uint8 array as JPEG to a path or binary file, preferring libjpeg-turbo's fast DCT"""
+        # Full-resolution chroma only at the top qualities, where 4:2:0 would undo the setting
+        full_chroma = quality >= 95
+        is_array = isinstance(img, np.ndarray)
+        if self._tj is not None and (is_array or img.mode == 'RGB'):
+            # The fast DCT and no Huffman optimisation pass
+            data = self._tj.encode(img if is_array else np.asarray(img), quality=quality, pixel_format=TJPF_RGB,
+                                   jpeg_subsample=TJSAMP_444 if full_chroma else TJSAMP_420, flags=TJFLAG_FASTDCT)
+        elif is_array and cv2 is not None:
+            # Arrays go straight to OpenCV's encoder (BGR order) instead of through a PIL image
+            sampling = cv2.IMWRITE_JPEG_SAMPLING_FACTOR_444 if full_chroma else cv2.IMWRITE_JPEG_SAMPLING_FACTOR_420
+            _, data = cv2.imencode('.jpg', cv2.cvtColor(img, cv2.COLOR_RGB2BGR),
+                                   [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_SAMPLING_FACTOR, sampling])
+        else:
+            if is_array:
+                img = Image.fromarray(img)
+            # No Huffman optimisation pass: about 3x slower to encode for roughly 5% smaller files
+            img.save(output_path, 'JPEG', quality=quality, optimize=False, progressive=False,
+                     subsampling='4:4:4' if full_chroma else '4:2:0')
+            return
+        
+        if hasattr(output_path, 'write'):
+            output_path.write(data)
+        else:
+            Path(output_path).write_bytes(data)
+    
+    def apply_presets_batch(self, items, processes=False):
+        """Apply presets to (input_path, platform) pairs concurrently, preserving input order"""
+        if not processes:
+            return list(self._pool.map(lambda item: self._apply_preset_to_own_file(*item), items))
+        
+        # One ImageProcessor per worker process, so pure-Python stages run on every core too
+        items = list(items)
+        if not items:
+            return []
+        input_paths, platforms = zip(*items)
+        return list(self._get_process_pool().map(_apply_preset_in_worker, input_paths, platforms))
+    
+    def _get_process_pool(self):
+        """Return the shared worker process pool, starting it on first use"""
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                # spawn: forking a process that already runs pool threads can deadlock the child
+                self._process_pool = ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                                         mp_context=multiprocessing.get_context('spawn'))
+            return self._process_pool
     
     def _apply_tiktok_advanced_preset(self, input_path, output_path):
         """TikTok: Research-based 2025 anti-algorithm system with dynamic variations"""
@@ -43,17 +424,18 @@ class ImageProcessor:
                 # Dynamic variation system - 5 different approaches
                 variation = self._get_dynamic_variation('tiktok')
                 
+                # Layers 1-4 stay NumPy arrays; PIL only comes back for the enhancers below
                 # Layer 1: FGS-Audio inspired adversarial perturbations for images
-                img = self._apply_adversarial_perturbations(img, variation)
+                arr = self._adversarial_arr(np.asarray(img), variation)
                 
                 # Layer 2: Reversible adversarial steganography with content-adaptive changes
-                img = self._apply_reversible_steganography(img, variation)
+                arr = self._reversible_stego_arr(arr, variation)
                 
                 # Layer 3: Hybrid DCT + GAN inspired frequency domain manipulation
-                img = self._apply_hybrid_dct_manipulation(img, variation)
+                arr = self._hybrid_dct_arr(arr, variation)
                 
                 # Layer 4: Triple-stage robust processing (inspired by audio research)
-                img = self._apply_triple_stage_processing(img, variation)
+                img = Image.fromarray(self._triple_stage_arr(arr, variation))
                 
                 # Layer 5: Platform-specific TikTok algorithm evasion
                 img = self._apply_tiktok_specific_evasion(img, variation)
@@ -63,7 +445,7 @@ class ImageProcessor:
                 
                 # Dynamic quality and compression to prevent pattern detection
                 quality = random.randint(78, 87)
-                img.save(output_path, 'JPEG', quality=quality, optimize=True)
+                self._save_jpeg(img, output_path, quality=quality)
                 
                 # Apply format conversion chain for additional evasion
                 output_path = self._apply_format_conversion_chain(output_path, variation)
@@ -85,39 +467,25 @@ class ImageProcessor:
                 # Square crop
                 img = self._crop_to_square(img)
                 
-                # Heavy color and contrast adjustments
-                enhancer = ImageEnhance.Color(img)
-                img = enhancer.enhance(1.28)
-                
-                enhancer = ImageEnhance.Contrast(img)
-                img = enhancer.enhance(1.14)
-                
-                enhancer = ImageEnhance.Brightness(img)
-                img = enhancer.enhance(1.05)
+                # Heavy color and contrast adjustments, with contrast and brightness as one cached lookup table
+                arr = self._color_contrast_arr(img, color=1.28, brightness=1.05, contrast=1.14)
                 
-                enhancer = ImageEnhance.Sharpness(img)
-                img = enhancer.enhance(1.18)
+                # Sharpening as a single 3x3 convolution on the evasion array
+                arr = self._sharpen_arr(arr, 1.18)
                 
-                # Strong film grain and noise
-                img = self._add_noise(img, intensity=22)
+                # Strong film grain and noise, with LSB and perceptual hash evasion fused in
+                arr = self._grain_and_hash_evasion_arr(arr, intensity=22)
                 
                 # Advanced algorithm evasion for Instagram
-                img = self._apply_steganographic_evasion(img, intensity=18)
-                img = self._apply_perceptual_hash_evasion(img)
-                img = self._apply_dct_domain_modifications(img)
+                arr = self._dct_arr(arr)
                 
                 # Color channel manipulation for algorithm confusion
-                img = self._adjust_color_channels(img, r_adjust=1.03, g_adjust=0.97, b_adjust=1.02)
+                arr = self._channels_arr(arr, r_adjust=1.03, g_adjust=0.97, b_adjust=1.02)
                 
-                # Micro rotation and resize
-                img = img.rotate(-0.3, expand=False, fillcolor=(0, 0, 0))
+                # Micro pixel shift (replaces a sub-degree rotation) and scale manipulation to change hash
+                arr = self._micro_warp_arr(arr, 1.002, fillcolor=(0, 0, 0))
                 
-                # Scale manipulation to change hash
-                width, height = img.size
-                img = img.resize((int(width * 1.002), int(height * 1.002)), Resampling.LANCZOS)
-                img = img.resize((width, height), Resampling.LANCZOS)
-                
-                img.save(output_path, 'JPEG', quality=88, optimize=True)
+                self._save_jpeg(arr, output_path, quality=88)
                 return output_path
         except Exception as e:
             raise Exception(f"Error in Instagram image preset: {e}")
@@ -130,42 +498,26 @@ class ImageProcessor:
                 if img.mode != 'RGB':
                     img = img.convert('RGB')
                 
-                # 16:9 letterbox
-                img = self._letterbox_16_9(img)
-                
-                # Heavy color and enhancement adjustments
-                enhancer = ImageEnhance.Color(img)
-                img = enhancer.enhance(1.38)
-                
-                enhancer = ImageEnhance.Sharpness(img)
-                img = enhancer.enhance(1.22)
-                
-                enhancer = ImageEnhance.Contrast(img)
-                img = enhancer.enhance(1.08)
+                # 16:9 letterbox first, so the enhancers and the contrast pivot see the padded canvas
+                img = Image.fromarray(self._letterbox_16_9_arr(np.asarray(img)))
                 
-                enhancer = ImageEnhance.Brightness(img)
-                img = enhancer.enhance(1.02)
+                # Heavy color and enhancement adjustments: Color, Sharpness (one 3x3
+                # convolution), then contrast and brightness as one cached lookup table
+                arr = self._color_contrast_arr(img, color=1.38, brightness=1.02, contrast=1.08, sharpness=1.22)
                 
-                # Algorithm evasion noise
-                img = self._add_noise(img, intensity=18)
+                # Algorithm evasion noise, with LSB and perceptual hash evasion fused in
+                arr = self._grain_and_hash_evasion_arr(arr, intensity=18)
                 
                 # Advanced YouTube-specific evasion
-                img = self._apply_steganographic_evasion(img, intensity=16)
-                img = self._apply_perceptual_hash_evasion(img)
-                img = self._apply_dct_domain_modifications(img)
+                arr = self._dct_arr(arr)
                 
                 # Color channel manipulation
-                img = self._adjust_color_channels(img, r_adjust=0.99, g_adjust=1.02, b_adjust=0.98)
+                arr = self._channels_arr(arr, r_adjust=0.99, g_adjust=1.02, b_adjust=0.98)
                 
-                # Tiny rotation for pixel position changes
-                img = img.rotate(0.2, expand=False, fillcolor=(1, 1, 1))
+                # Tiny pixel shift and scale manipulation for pixel position changes
+                arr = self._micro_warp_arr(arr, 1.001, fillcolor=(1, 1, 1))
                 
-                # Scale manipulation
-                width, height = img.size
-                img = img.resize((int(width * 1.001), int(height * 1.001)), Resampling.LANCZOS)
-                img = img.resize((width, height), Resampling.LANCZOS)
-                
-                img.save(output_path, 'JPEG', quality=91, optimize=True)
+                self._save_jpeg(arr, output_path, quality=91)
                 return output_path
         except Exception as e:
             raise Exception(f"Error in YouTube image preset: {e}")
@@ -178,49 +530,33 @@ class ImageProcessor:
                 if img.mode != 'RGB':
                     img = img.convert('RGB')
                 
-                # 9:16 vertical format for YouTube Shorts
-                img = self._crop_to_vertical_9_16(img)
-                
-                # Heavy color and enhancement adjustments (same as YouTube but optimized for Shorts)
-                enhancer = ImageEnhance.Color(img)
-                img = enhancer.enhance(1.38)
-                
-                enhancer = ImageEnhance.Sharpness(img)
-                img = enhancer.enhance(1.22)
+                # 9:16 vertical format for YouTube Shorts first, so the enhancers and the contrast pivot see the padded canvas
+                img = Image.fromarray(self._crop_to_vertical_9_16_arr(np.asarray(img)))
                 
-                enhancer = ImageEnhance.Contrast(img)
-                img = enhancer.enhance(1.08)
+                # Heavy color and enhancement adjustments (same as YouTube but optimized for Shorts): Color, Sharpness (one 3x3
+                # convolution), then contrast and brightness as one cached lookup table
+                arr = self._color_contrast_arr(img, color=1.38, brightness=1.02, contrast=1.08, sharpness=1.22)
                 
-                enhancer = ImageEnhance.Brightness(img)
-                img = enhancer.enhance(1.02)
-                
-                # Algorithm evasion noise (same intensity as YouTube)
-                img = self._add_noise(img, intensity=18)
+                # Algorithm evasion noise (same intensity as YouTube), with LSB and perceptual hash evasion fused in
+                arr = self._grain_and_hash_evasion_arr(arr, intensity=18)
                 
                 # Advanced YouTube Shorts-specific evasion (same techniques as YouTube)
-                img = self._apply_steganographic_evasion(img, intensity=16)
-                img = self._apply_perceptual_hash_evasion(img)
-                img = self._apply_dct_domain_modifications(img)
+                arr = self._dct_arr(arr)
                 
                 # Color channel manipulation (same as YouTube)
-                img = self._adjust_color_channels(img, r_adjust=0.99, g_adjust=1.02, b_adjust=0.98)
-                
-                # Tiny rotation for pixel position changes
-                img = img.rotate(0.2, expand=False, fillcolor=(1, 1, 1))
+                arr = self._channels_arr(arr, r_adjust=0.99, g_adjust=1.02, b_adjust=0.98)
                 
-                # Scale manipulation
-                width, height = img.size
-                img = img.resize((int(width * 1.001), int(height * 1.001)), Resampling.LANCZOS)
-                img = img.resize((width, height), Resampling.LANCZOS)
+                # Tiny pixel shift and scale manipulation for pixel position changes
+                arr = self._micro_warp_arr(arr, 1.001, fillcolor=(1, 1, 1))
                 
-                img.save(output_path, 'JPEG', quality=91, optimize=True)
+                self._save_jpeg(arr, output_path, quality=91)
                 return output_path
         except Exception as e:
             raise Exception(f"Error in YouTube Shorts image preset: {e}")
     
     def apply_custom_commands(self, input_path, commands):
         """Apply custom commands to image"""
-        output_path = os.path.join(self.temp_dir, f"custom_{Path(input_path).stem}.jpg")
+        output_path = os.path.join(self.temp_dir, f"custom_{_stem(input_path)}.jpg")
         
         try:
             with Image.open(input_path) as img:
@@ -228,14 +564,60 @@ class ImageProcessor:
                 if img.mode != 'RGB':
                     img = img.convert('RGB')
                 
-                for command in commands:
-                    img = self._apply_image_command(img, command)
+                img = self._apply_image_commands(img, commands)
                 
-                img.save(output_path, 'JPEG', quality=90)
+                self._save_jpeg(img, output_path, quality=90)
                 return output_path
         except Exception as e:
             raise Exception(f"Error in custom image commands: {e}")
     
+    def _apply_image_commands(self, img, commands):
+        """Apply commands in order, folding runs of brightness and contrast into one lookup table"""
+        # Both enhancers blend every level against a constant, so each is a 256-entry table
+        # (black for brightness, the grey mean for contrast) and a run of them composes into one
+        pending = None
+        for command in commands:
+            cmd_type = command['type']
+            if cmd_type not in ('brightness', 'contrast'):
+                if pending is not None:
+                    img = self._point(img, pending)
+                    pending = None
+                img = self._apply_image_command(img, command)
+                continue
+            
+            value = command['params'].get('value', 100) / 100.0
+            if value == 1.0:
+                continue
+            if cmd_type == 'brightness':
+                table = _blend_table(value)[0]
+            else:
+                # Contrast pivots on the grey mean of the image as it stands, so apply the run first
+                if pending is not None:
+                    img = self._point(img, pending)
+                    pending = None
+                table = _blend_table(value)[self._contrast_mean(img)]
+            pending = table if pending is None else table[pending]
+        
+        if pending is not None:
+            img = self._point(img, pending)
+        return img
+    
+    def _point(self, img, table):
+        """Map every band of an image through one 256-entry table, in horizontal stripes on large images"""
+        lut = table.tolist() * len(img.getbands())
+        width, height = img.size
+        stripes = min(os.cpu_count() or 1, height)
+        if width * height <= 2_000_000 or stripes < 2:
+            return img.point(lut)
+        
+        # Image.point releases the GIL, so the stripes map in parallel on the shared pool
+        bounds = [height * i // stripes for i in range(stripes + 1)]
+        boxes = [(0, top, width, bottom) for top, bottom in zip(bounds, bounds[1:])]
+        out = Image.new(img.mode, img.size)
+        for box, stripe in zip(boxes, self._pool.map(lambda box: img.crop(box).point(lut), boxes)):
+            out.paste(stripe, box)
+        return out
+    
     def _apply_image_command(self, img, command):
         """Apply individual image command"""
         cmd_type = command['type']
@@ -249,18 +631,15 @@ class ImageProcessor:
         
         elif cmd_type == 'brightness':
             value = params.get('value', 100) / 100.0
-            enhancer = ImageEnhance.Brightness(img)
-            return enhancer.enhance(value)
+            return self._enhance(img, ImageEnhance.Brightness, value)
         
         elif cmd_type == 'contrast':
             value = params.get('value', 100) / 100.0
-            enhancer = ImageEnhance.Contrast(img)
-            return enhancer.enhance(value)
+            return self._enhance(img, ImageEnhance.Contrast, value)
         
         elif cmd_type == 'color':
             value = params.get('value', 100) / 100.0
-            enhancer = ImageEnhance.Color(img)
-            return enhancer.enhance(value)
+            return self._enhance(img, ImageEnhance.Color, value)
         
         elif cmd_type == 'crop':
             if params.get('shape') == 'square':
@@ -268,6 +647,8 @@ class ImageProcessor:
         
         elif cmd_type == 'rotate':
             angle = params.get('angle', 0)
+            if angle % 360 == 0:
+                return img
             return img.rotate(angle, expand=True)
         
         elif cmd_type == 'vintage':
@@ -279,6 +660,36 @@ class ImageProcessor:
         
         return img
     
+    def _color_contrast_arr(self, img, color, brightness, contrast, sharpness=1.0):
+        """Return ImageEnhance Color, Sharpness, then Contrast and Brightness, of an RGB image as a uint8 array"""
+        if njit is None:
+            img = self._enhance(img, ImageEnhance.Color, color)
+            img_array = np.asarray(img)
+            mean = None
+        else:
+            # Colour blend and the grey sum for the contrast pivot in one pass
+            source = np.asarray(img)
+            img_array = np.empty_like(source)
+            grey_total = _color_grey(source, _blend_table(color), img_array)
+            mean = int(grey_total / (source.shape[0] * source.shape[1]) + 0.5)
+        
+        if sharpness != 1.0:
+            # Each step clips and truncates to uint8, so sharpening keeps its place before
+            # contrast; it also moves the contrast pivot, which is measured again
+            img_array = self._sharpen_arr(img_array, sharpness)
+            mean = None
+        if mean is None:
+            mean = self._contrast_mean(Image.fromarray(img_array))
+        
+        # Contrast and brightness as one table lookup
+        return self._apply_lut_arr(img_array, self._affine_lut(brightness=brightness, contrast=contrast, mean=mean))
+    
+    def _enhance(self, img, enhancer, factor):
+        """Apply a PIL ImageEnhance class, skipping the blend when the factor is a no-op"""
+        if factor == 1.0:
+            return img
+        return enhancer(img).enhance(factor)
+    
     def _crop_to_square(self, img):
         """Crop image to square aspect ratio"""
         width, height = img.size
@@ -309,71 +720,146 @@ class ImageProcessor:
         # Resize to exact Instagram Reels dimensions
         return img.resize((1080, 1920), Resampling.LANCZOS)
     
-    def _letterbox_16_9(self, img):
+    def _letterbox_16_9_arr(self, arr):
         """Add letterbox padding to make 16:9 aspect ratio"""
-        width, height = img.size
-        target_ratio = 16 / 9
-        current_ratio = width / height
+        return self._pad_to_ratio_arr(arr, 16 / 9)
+    
+    def _crop_to_vertical_9_16_arr(self, arr):
+        """Pad image to vertical 9:16 aspect ratio for YouTube Shorts"""
+        return self._pad_to_ratio_arr(arr, 9 / 16)
+    
+    def _pad_to_ratio_arr(self, arr, target_ratio):
+        """Center a uint8 array on a black canvas of the target aspect ratio"""
+        height, width = arr.shape[:2]
         
-        if current_ratio > target_ratio:
-            # Image is wider than 16:9, add vertical padding
-            new_height = int(width / target_ratio)
-            new_img = Image.new('RGB', (width, new_height), color='black')
-            paste_y = (new_height - height) // 2
-            new_img.paste(img, (0, paste_y))
+        if width / height > target_ratio:
+            # Image is wider than target, add vertical padding
+            new_height, new_width = int(width / target_ratio), width
         else:
-            # Image is taller than 16:9, add horizontal padding
-            new_width = int(height * target_ratio)
-            new_img = Image.new('RGB', (new_width, height), color='black')
-            paste_x = (new_width - width) // 2
-            new_img.paste(img, (paste_x, 0))
-        
-        return new_img
+            # Image is taller than target, add horizontal padding
+            new_height, new_width = height, int(height * target_ratio)
+        
+        # Already at the target ratio: a writable input is returned as is, no canvas needed
+        if (new_height, new_width) == (height, width) and arr.flags.writeable:
+            return arr
+        
+        paste_y = (new_height - height) // 2
+        paste_x = (new_width - width) // 2
+        if new_width == width:
+            # Top/bottom bars are contiguous: zero just those and copy the frame in one block
+            out = np.empty((new_height, new_width, 3), dtype=np.uint8)
+            out[:paste_y] = 0
+            out[paste_y + height:] = 0
+            out[paste_y:paste_y + height] = arr
+            return out
+
+        # Side bars are strided per row, where np.zeros' pre-zeroed OS pages measured faster
+        # than both np.empty plus bar fills and cv2.copyMakeBorder
+        out = np.zeros((new_height, new_width, 3), dtype=np.uint8)
+        out[paste_y:paste_y + height, paste_x:paste_x + width] = arr
+        return out
     
-    def _crop_to_vertical_9_16(self, img):
-        """Crop/pad image to vertical 9:16 aspect ratio for YouTube Shorts"""
-        width, height = img.size
-        target_ratio = 9 / 16  # vertical aspect ratio
-        current_ratio = width / height
-        
-        if current_ratio > target_ratio:
-            # Image is wider than 9:16, add vertical padding
-            new_height = int(width / target_ratio)
-            new_img = Image.new('RGB', (width, new_height), color='black')
-            paste_y = (new_height - height) // 2
-            new_img.paste(img, (0, paste_y))
+    def _sharpen_arr(self, arr, factor):
+        """Return a sharpened uint8 copy of an RGB array, equivalent to ImageEnhance.Sharpness"""
+        # PIL blends the image with its SMOOTH-filtered copy; fold both into one kernel
+        kernel = np.full((3, 3), (1 - factor) / 13, dtype=np.float32)
+        kernel[1, 1] = factor + (1 - factor) * 5 / 13
+        
+        if cv2 is not None:
+            sharpened = cv2.filter2D(arr, -1, kernel, borderType=cv2.BORDER_REPLICATE)
         else:
-            # Image is taller than 9:16, add horizontal padding
-            new_width = int(height * target_ratio)
-            new_img = Image.new('RGB', (new_width, height), color='black')
-            paste_x = (new_width - width) // 2
-            new_img.paste(img, (paste_x, 0))
-        
-        return new_img
+            filtered = ndimage.correlate(arr.astype(np.float32), kernel[:, :, np.newaxis], mode='nearest')
+            np.clip(filtered, 0, 255, out=filtered)
+            sharpened = np.rint(filtered).astype(np.uint8)
+        
+        # PIL leaves the one-pixel border untouched
+        sharpened[[0, -1], :] = arr[[0, -1], :]
+        sharpened[:, [0, -1]] = arr[:, [0, -1]]
+        return sharpened
+    
+    def _micro_warp_arr(self, arr, scale, fillcolor=(0, 0, 0)):
+        """Shift pixels one row down and one column left and resample at a tiny scale change"""
+        if scale == 1.0:
+            return self._shift_pixels_arr(arr, fillcolor=fillcolor)
+        if cv2 is None:
+            # Shift, then a bilinear up/down resize round trip, skipped when the scale truncates away
+            shifted = self._shift_pixels_arr(arr, fillcolor=fillcolor)
+            height, width = shifted.shape[:2]
+            scaled_size = (int(width * scale), int(height * scale))
+            if scaled_size == (width, height):
+                return shifted
+            img = Image.fromarray(shifted).resize(scaled_size, Resampling.BILINEAR)
+            return np.asarray(img.resize((width, height), Resampling.BILINEAR))
+        
+        # Both in a single bilinear resample: scale about the centre plus the one-pixel shift
+        height, width = arr.shape[:2]
+        matrix = cv2.getRotationMatrix2D((width / 2, height / 2), 0, scale)
+        matrix[0, 2] -= 1
+        matrix[1, 2] += 1
+        return cv2.warpAffine(arr, matrix, (width, height), flags=cv2.INTER_LINEAR,
+                              borderMode=cv2.BORDER_CONSTANT, borderValue=fillcolor)
+    
+    def _shift_pixels_arr(self, arr, fillcolor=(0, 0, 0)):
+        """Move every pixel one row down and one column left, filling the exposed edges"""
+        shifted = np.empty_like(arr)
+        shifted[1:, :-1] = arr[:-1, 1:]
+        shifted[0, :] = fillcolor
+        shifted[:, -1] = fillcolor
+        return shifted
     
     def _add_noise(self, img, intensity=15):
         """Add noise/grain to image"""
-        img_array = np.array(img)
-        noise = np.random.randint(-intensity, intensity + 1, img_array.shape, dtype=np.int16)
-        noisy_array = np.clip(img_array.astype(np.int16) + noise, 0, 255).astype(np.uint8)
-        return Image.fromarray(noisy_array)
+        return Image.fromarray(self._add_noise_arr(np.asarray(img), intensity))
+    
+    def _add_noise_arr(self, arr, intensity=15):
+        """Add noise/grain to a uint8 array, in place when writable"""
+        if intensity == 0:
+            return arr
+        out = arr if arr.flags.writeable else np.empty_like(arr)
+        noise = self._grain(intensity, arr.shape)
+        if cv2 is not None and arr.flags.c_contiguous and out.flags.c_contiguous:
+            # Widen, add and saturate into out in one SIMD pass
+            return cv2.add(arr, noise, dst=out, dtype=cv2.CV_8U)
+        # Freshly drawn int16 noise doubles as the widened sum; a pooled window is read-only
+        if noise.flags.writeable:
+            np.add(noise, arr, out=noise)
+        else:
+            noise = np.add(noise, arr, dtype=np.int16)
+        np.clip(noise, 0, 255, out=noise)
+        np.copyto(out, noise, casting='unsafe')
+        return out
+    
+    def _grain(self, intensity, shape):
+        """Return uniform integer grain in [-intensity, intensity] of the given shape"""
+        size = int(np.prod(shape))
+        if intensity > 127 or size > _NOISE_POOL_SIZE // 2:
+            return self._rng.integers(-intensity, intensity + 1, shape, dtype=np.int16)
+        # A random window of the per-intensity pool instead of millions of fresh draws
+        start = int(self._rng.integers(0, _NOISE_POOL_SIZE - size + 1))
+        return _noise_pool(intensity)[start:start + size].reshape(shape)
+    
+    def _scratch_buffer(self, name, shape, dtype):
+        """Return this thread's named scratch buffer, reallocating only when the shape changes"""
+        buffer = getattr(self._scratch, name, None)
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype=dtype)
+            setattr(self._scratch, name, buffer)
+        return buffer
     
     def _apply_vintage_filter(self, img):
         """Apply vintage/sepia filter"""
-        # Convert to sepia
-        img_array = np.array(img)
-        sepia_filter = np.array([
-            [0.393, 0.769, 0.189],
-            [0.349, 0.686, 0.168],
-            [0.272, 0.534, 0.131]
-        ])
-        
-        sepia_img = img_array @ sepia_filter.T
-        sepia_img = np.clip(sepia_img, 0, 255).astype(np.uint8)
-        vintage_img = Image.fromarray(sepia_img)
+        if njit is not None:
+            # Sepia, grain and the grey-level sum for the contrast pivot in one pass
+            img_array = np.asarray(img)
+            vintage = np.empty_like(img_array)
+            grey_total = _sepia_grain(img_array, self._sepia_tables, 10, self._rng.integers(1, 2**63), vintage)
+            mean = int(grey_total / (img_array.shape[0] * img_array.shape[1]) + 0.5)
+            
+            # Reduce contrast slightly for vintage look, with ImageEnhance.Contrast's table
+            return Image.fromarray(self._apply_lut_arr(vintage, self._affine_lut(contrast=0.9, mean=mean)))
         
-        # Add slight grain
-        vintage_img = self._add_noise(vintage_img, intensity=10)
+        # Sepia and grain run on one array; PIL only for the contrast step
+        vintage_img = Image.fromarray(self._vintage_arr(np.asarray(img)))
         
         # Reduce contrast slightly for vintage look
         enhancer = ImageEnhance.Contrast(vintage_img)
@@ -381,83 +867,155 @@ class ImageProcessor:
         
         return vintage_img
     
+    def _vintage_arr(self, img_array):
+        """Return a sepia-toned, lightly grained uint8 copy of an RGB array"""
+        # Add slight grain to the sepia tone
+        return self._add_noise_arr(self._sepia_arr(img_array), intensity=10)
+    
+    def _sepia_arr(self, img_array):
+        """Return a sepia-toned uint8 copy of an RGB array"""
+        if cv2 is not None:
+            # Per-pixel 3x3 transform with a saturating cast back to uint8 in one call
+            return cv2.transform(img_array, self._sepia_f32)
+        
+        # Convert to sepia in float32 straight into a reused buffer
+        sepia = self._scratch_buffer('f32', img_array.shape, np.float32)
+        np.matmul(img_array, self._sepia_f32_t, out=sepia)
+        np.clip(sepia, 0, 255, out=sepia)
+        return sepia.astype(np.uint8)
+    
     def _adjust_color_channels(self, img, r_adjust=1.0, g_adjust=1.0, b_adjust=1.0):
         """Adjust individual color channels for algorithm evasion"""
-        img_array = np.array(img)
-        
-        # Adjust each channel separately
-        img_array[:, :, 0] = np.clip(img_array[:, :, 0] * r_adjust, 0, 255)  # Red
-        img_array[:, :, 1] = np.clip(img_array[:, :, 1] * g_adjust, 0, 255)  # Green
-        img_array[:, :, 2] = np.clip(img_array[:, :, 2] * b_adjust, 0, 255)  # Blue
-        
-        return Image.fromarray(img_array.astype(np.uint8))
+        return Image.fromarray(self._channels_arr(np.asarray(img), r_adjust, g_adjust, b_adjust))
+    
+    def _channels_arr(self, arr, r_adjust=1.0, g_adjust=1.0, b_adjust=1.0):
+        """Scale the R, G and B channels of a uint8 array, in place when writable"""
+        if r_adjust == g_adjust == b_adjust == 1.0:
+            return arr
+        return self._apply_lut_arr(arr, self._affine_lut(r_adjust=r_adjust, g_adjust=g_adjust, b_adjust=b_adjust))
+    
+    def _contrast_mean(self, img):
+        """Return the grey level ImageEnhance.Contrast pivots around"""
+        return int(ImageStat.Stat(img.convert('L')).mean[0] + 0.5)
+    
+    def _affine_lut(self, brightness=1.0, contrast=1.0, mean=0, r_adjust=1.0, g_adjust=1.0, b_adjust=1.0, cache=True):
+        """Return a cached (3, 256) uint8 LUT for contrast, brightness and per-channel scaling"""
+        key = (brightness, contrast, mean, r_adjust, g_adjust, b_adjust)
+        lut = self._lut_cache.get(key) if cache else None
+        if lut is None:
+            # Same truncating steps as ImageEnhance.Contrast followed by ImageEnhance.Brightness
+            levels = np.arange(256, dtype=np.float64)
+            levels = np.clip(mean + contrast * (levels - mean), 0, 255).astype(np.uint8)
+            levels = np.clip(levels * brightness, 0, 255).astype(np.uint8)
+            scales = np.array([r_adjust, g_adjust, b_adjust])[:, np.newaxis]
+            lut = np.clip(levels * scales, 0, 255).astype(np.uint8)
+            if cache:
+                self._lut_cache[key] = lut
+        return lut
+    
+    def _apply_lut_arr(self, arr, lut):
+        """Map each channel of a uint8 array through its row of a (3, 256) LUT, in place when writable"""
+        # A read-only input (np.asarray of a PIL image) is mapped into a fresh array instead of copied first
+        out = arr if arr.flags.writeable else np.empty_like(arr)
+        if cv2 is not None and arr.flags.c_contiguous and out.flags.c_contiguous:
+            # cv2.LUT wants the tables interleaved like the pixels: (256, 1, 3)
+            return cv2.LUT(arr, np.ascontiguousarray(lut.T[:, np.newaxis, :]), dst=out)
+        for c in range(3):
+            out[:, :, c] = lut[c][arr[:, :, c]]
+        return out
     
     def _apply_steganographic_evasion(self, img, intensity=15):
         """Apply LSB steganography-based evasion to modify hash"""
-        img_array = np.array(img)
-        height, width, channels = img_array.shape
+        return Image.fromarray(self._stego_arr(np.array(img), intensity))
+    
+    def _stego_arr(self, img_array, intensity=15):
+        """Flip LSBs of a uint8 array in place to modify hash"""
+        # Every 8th pixel in both directions is a candidate; this is a view into img_array
+        grid = img_array[::8, ::8]
         
-        # Generate pseudo-random modifications based on pixel positions
-        np.random.seed(42)  # Consistent but unpredictable pattern
-        for i in range(0, height, 8):
-            for j in range(0, width, 8):
-                # Modify LSB of random pixels to change hash
-                if np.random.random() > 0.7:
-                    # Flip least significant bit
-                    for c in range(channels):
-                        if i < height and j < width:
-                            img_array[i, j, c] = img_array[i, j, c] ^ 1
+        # Flip least significant bit of the selected pixels in all channels
+        grid[_stego_selection(grid.shape[:2])] ^= 1
         
-        return Image.fromarray(img_array)
+        return img_array
     
     def _apply_perceptual_hash_evasion(self, img):
         """Apply gradient-based perturbations to evade perceptual hashing"""
-        img_array = np.array(img).astype(np.float32)
-        height, width, channels = img_array.shape
-        
+        return Image.fromarray(self._phash_arr(np.asarray(img)))
+    
+    def _grain_and_hash_evasion_arr(self, arr, intensity=15):
+        """Return _phash_arr(_stego_arr(_add_noise_arr(arr))) computed in a single pass where possible"""
+        if njit is None:
+            return self._phash_arr(self._stego_arr(self._add_noise_arr(arr, intensity)))
+        
+        # Draw in the same order as the separate helpers so both paths give identical output
+        grain = self._grain(intensity, arr.shape)
+        gradient_noise = self._rng.integers(-2, 3, arr.shape, dtype=np.int16)
+        flip_grid = _stego_selection(arr[::8, ::8].shape[:2])
+        
+        modified_array = np.empty_like(arr)
+        _grain_flip_edge_noise(arr, grain, flip_grid, gradient_noise, 510 * arr.shape[2], modified_array)
+        return modified_array
+    
+    def _phash_arr(self, img_array):
+        """Return a uint8 array with edge-weighted noise added to evade perceptual hashing"""
         # Add minimal gradient-based noise that changes hash but preserves perception
-        gradient_noise = np.random.uniform(-2, 2, (height, width, channels))
+        gradient_noise = self._rng.integers(-2, 3, img_array.shape, dtype=np.int16)
         
-        # Apply noise more heavily to edges and high-frequency areas
-        from scipy import ndimage
-        edges = ndimage.sobel(np.mean(img_array, axis=2))
-        edges_3d = np.stack([edges] * channels, axis=2)
+        # Noise is amplified by 1 + mean_edge / 255 * 0.5, i.e. by channel_sum_edge / (510 * channels)
+        edge_divisor = 510 * img_array.shape[2]
+        
+        if njit is not None:
+            # Sobel, edge weighting, add and clip fused into one pass over the image
+            modified_array = np.empty_like(img_array)
+            _edge_weighted_noise(img_array, gradient_noise, edge_divisor, modified_array)
+            return modified_array
+        
+        # Gradient magnitude as |dx| + |dy| of the channel sum in int16 (bounded by 2 * 765)
+        channel_sum = img_array.sum(axis=2, dtype=np.int16)
+        edges = np.abs(np.diff(channel_sum, axis=1, prepend=channel_sum[:, :1]))
+        edges += np.abs(np.diff(channel_sum, axis=0, prepend=channel_sum[:1]))
         
         # Amplify noise in edge regions
-        adaptive_noise = gradient_noise * (1 + edges_3d / 255.0 * 0.5)
+        gradient_noise += gradient_noise * edges[:, :, np.newaxis] // edge_divisor
         
-        modified_array = img_array + adaptive_noise
-        modified_array = np.clip(modified_array, 0, 255).astype(np.uint8)
+        modified = self._scratch_buffer('i16', img_array.shape, np.int16)
+        np.add(img_array, gradient_noise, out=modified)
+        np.clip(modified, 0, 255, out=modified)
         
-        return Image.fromarray(modified_array)
+        return modified.astype(np.uint8)
     
     def _apply_dct_domain_modifications(self, img):
         """Apply discrete cosine transform domain modifications"""
-        img_array: NDArray[Any] = np.array(img)
+        return Image.fromarray(self._dct_arr(np.array(img)))
+    
+    def _dct_arr(self, img_array: NDArray[Any]) -> NDArray[Any]:
+        """Apply DCT domain modifications to a uint8 array in place"""
         height, width, channels = img_array.shape
         
-        # Process in 8x8 blocks like JPEG compression
-        for i in range(0, height - 8, 8):
-            for j in range(0, width - 8, 8):
-                for c in range(channels):
-                    block: NDArray[Any] = img_array[i:i+8, j:j+8, c].astype(np.float32)
-                    
-                    # Apply DCT
-                    from scipy.fft import dctn, idctn
-                    dct_block: NDArray[Any] = np.asarray(dctn(block, norm='ortho'))
-                    
-                    # Modify high-frequency coefficients slightly
-                    if np.random.random() > 0.6:
-                        noise: NDArray[Any] = np.random.uniform(-0.5, 0.5, (2, 2))
-                        high_freq_slice = dct_block[6:8, 6:8]
-                        dct_block[6:8, 6:8] = high_freq_slice + noise
-                    
-                    # Apply inverse DCT
-                    modified_block: NDArray[Any] = np.asarray(idctn(dct_block, norm='ortho'))
-                    clipped_block: NDArray[Any] = np.clip(modified_block, 0, 255)
-                    img_array[i:i+8, j:j+8, c] = clipped_block
-        
-        return Image.fromarray(img_array.astype(np.uint8))
+        # Process in 8x8 blocks like JPEG compression, all blocks at once
+        rows = len(range(0, height - 8, 8))
+        cols = len(range(0, width - 8, 8))
+        if rows == 0 or cols == 0:
+            return img_array
+        region = img_array[:rows * 8, :cols * 8]
+        blocks = region.reshape(rows, 8, cols, 8, channels).transpose(0, 2, 4, 1, 3).astype(np.float32)
+        
+        # Apply DCT as two small matmuls against the precomputed basis
+        basis = self._dct_basis
+        dct_blocks = basis @ blocks @ basis.T
+        
+        # Modify high-frequency coefficients slightly in ~40% of the block channels
+        noise = self._rng.uniform(-0.5, 0.5, (rows, cols, channels, 2, 2)).astype(np.float32)
+        noise *= (self._rng.random((rows, cols, channels)) > 0.6)[..., np.newaxis, np.newaxis]
+        dct_blocks[..., 6:8, 6:8] += noise
+        
+        # Apply inverse DCT
+        modified_blocks = basis.T @ dct_blocks @ basis
+        np.clip(modified_blocks, 0, 255, out=modified_blocks)
+        np.copyto(region, modified_blocks.transpose(0, 3, 1, 4, 2).reshape(rows * 8, cols * 8, channels),
+                  casting='unsafe')
+        
+        return img_array
     
     def apply_custom_command(self, input_path, commands):
         """Apply custom commands to image"""
@@ -472,7 +1030,7 @@ class ImageProcessor:
                 for command in commands:
                     img = self._apply_single_command(img, command)
                 
-                img.save(output_path, 'JPEG', quality=85, optimize=True)
+                self._save_jpeg(img, output_path, quality=85)
                 return output_path
         except Exception as e:
             raise Exception(f"Error applying custom commands: {e}")
@@ -484,20 +1042,19 @@ class ImageProcessor:
         
         # Basic adjustments
         if cmd_type == 'brightness':
-            enhancer = ImageEnhance.Brightness(img)
-            return enhancer.enhance(params['value'] / 100.0)
+            return self._enhance(img, ImageEnhance.Brightness, params['value'] / 100.0)
         elif cmd_type == 'contrast':
-            enhancer = ImageEnhance.Contrast(img)
-            return enhancer.enhance(params['value'] / 100.0)
+            return self._enhance(img, ImageEnhance.Contrast, params['value'] / 100.0)
         elif cmd_type == 'color':
-            enhancer = ImageEnhance.Color(img)
-            return enhancer.enhance(params['value'] / 100.0)
+            return self._enhance(img, ImageEnhance.Color, params['value'] / 100.0)
         elif cmd_type == 'flip':
             if params['direction'] == 'horizontal':
                 return img.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
             else:
                 return img.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
         elif cmd_type == 'rotate':
+            if params['degrees'] % 360 == 0:
+                return img
             return img.rotate(params['degrees'], expand=False, fillcolor=(0, 0, 0))
         elif cmd_type == 'crop':
             if params['shape'] == 'square':
@@ -513,8 +1070,7 @@ class ImageProcessor:
             from PIL import ImageFilter
             return img.filter(ImageFilter.GaussianBlur(radius=params['strength']))
         elif cmd_type == 'sharpen':
-            enhancer = ImageEnhance.Sharpness(img)
-            return enhancer.enhance(params['strength'])
+            return self._enhance(img, ImageEnhance.Sharpness, params['strength'])
         elif cmd_type == 'grain':
             return self._add_noise(img, params['amount'])
         elif cmd_type == 'glitch':
@@ -531,22 +1087,23 @@ class ImageProcessor:
             from PIL import ImageOps
             return ImageOps.invert(img)
         elif cmd_type == 'mirror':
+            # The left/top half stays where it is, so start from a copy and paste only the
+            # mirrored half; an odd last column/row stays black as on a fresh canvas
+            width, height = img.size
+            result = img.copy()
             if params['direction'] == 'horizontal':
-                width, height = img.size
-                left = img.crop((0, 0, width//2, height))
-                mirrored = left.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
-                result = Image.new('RGB', (width, height))
-                result.paste(left, (0, 0))
-                result.paste(mirrored, (width//2, 0))
-                return result
+                half = width // 2
+                mirrored = img.transpose(Image.Transpose.FLIP_LEFT_RIGHT).crop((width - half, 0, width, height))
+                result.paste(mirrored, (half, 0))
+                if width % 2:
+                    result.paste((0, 0, 0), (width - 1, 0, width, height))
             else:
-                width, height = img.size
-                top = img.crop((0, 0, width, height//2))
-                mirrored = top.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
-                result = Image.new('RGB', (width, height))
-                result.paste(top, (0, 0))
-                result.paste(mirrored, (0, height//2))
-                return result
+                half = height // 2
+                mirrored = img.transpose(Image.Transpose.FLIP_TOP_BOTTOM).crop((0, height - half, width, height))
+                result.paste(mirrored, (0, half))
+                if height % 2:
+                    result.paste((0, 0, 0), (0, height - 1, width, height))
+            return result
         elif cmd_type == 'pixelate':
             size = params['pixel_size']
             width, height = img.size
@@ -569,8 +1126,7 @@ class ImageProcessor:
         elif cmd_type == 'hue':
             return self._adjust_hue(img, params['shift'])
         elif cmd_type == 'saturation':
-            enhancer = ImageEnhance.Color(img)
-            return enhancer.enhance(params['factor'])
+            return self._enhance(img, ImageEnhance.Color, params['factor'])
         elif cmd_type == 'vignette':
             return self._apply_vignette(img, params['strength'])
         elif cmd_type == 'tilt':
@@ -597,176 +1153,124 @@ class ImageProcessor:
         img_array = np.array(img)
         height, width, channels = img_array.shape
         
-        # Random horizontal shifts
-        for _ in range(int(intensity)):
-            y = np.random.randint(0, height)
-            shift = np.random.randint(-20, 20)
+        # Random horizontal shifts, drawn up front; each row copy is already a single memmove
+        rows = self._rng.integers(0, height, size=int(intensity)).tolist()
+        shifts = self._rng.integers(-20, 20, size=int(intensity)).tolist()
+        for y, shift in zip(rows, shifts):
             if shift > 0:
                 img_array[y, shift:] = img_array[y, :-shift]
             elif shift < 0:
                 img_array[y, :shift] = img_array[y, -shift:]
         
         # Color channel corruption
-        if np.random.random() > 0.5:
-            channel = np.random.randint(0, 3)
-            corruption = np.random.randint(0, 50)
+        if self._rng.random() > 0.5:
+            channel = self._rng.integers(0, 3)
+            corruption = self._rng.integers(0, 50)
             img_array[:, :, channel] = np.clip(img_array[:, :, channel] + corruption, 0, 255)
         
-        return Image.fromarray(img_array.astype(np.uint8))
+        return Image.fromarray(img_array)
     
     def _apply_chromatic_aberration(self, img, shift):
         """Apply chromatic aberration effect"""
-        img_array = np.array(img)
-        height, width, channels = img_array.shape
-        
-        # Shift red and blue channels
-        red_shifted = np.zeros_like(img_array)
-        blue_shifted = np.zeros_like(img_array)
-        
+        img_array = np.asarray(img)
         shift = int(shift)
         
-        # Red channel shift
-        red_shifted[:-shift, :-shift, 0] = img_array[shift:, shift:, 0]
-        red_shifted[:, :, 1] = img_array[:, :, 1]
-        
-        # Blue channel shift  
-        blue_shifted[shift:, shift:, 2] = img_array[:-shift, :-shift, 2]
-        blue_shifted[:, :, 1] = img_array[:, :, 1]
-        
-        # Combine with original green
+        # Compose straight into one zeroed result: original green, red and blue shifted diagonally
         result = np.zeros_like(img_array)
-        result[:, :, 0] = red_shifted[:, :, 0]
         result[:, :, 1] = img_array[:, :, 1]
-        result[:, :, 2] = blue_shifted[:, :, 2]
+        if shift > 0:
+            result[:-shift, :-shift, 0] = img_array[shift:, shift:, 0]
+            result[shift:, shift:, 2] = img_array[:-shift, :-shift, 2]
+        else:
+            result[:, :, 0::2] = img_array[:, :, 0:3:2]
         
-        return Image.fromarray(result.astype(np.uint8))
+        return Image.fromarray(result)
     
     def _apply_vhs_effect(self, img):
         """Apply VHS tape effect"""
         img_array = np.array(img)
         
-        # Add horizontal noise lines
-        for i in range(0, img_array.shape[0], 3):
-            if np.random.random() > 0.7:
-                img_array[i] = np.clip(img_array[i] + np.random.randint(-30, 30), 0, 255)
+        # Add horizontal noise lines: every third row, each hit with 30% chance
+        rows = np.arange(0, img_array.shape[0], 3)
+        rows = rows[self._rng.random(rows.size) > 0.7]
+        if rows.size:
+            offsets = self._rng.integers(-30, 30, size=rows.size, dtype=np.int16)[:, None, None]
+            img_array[rows] = np.clip(img_array[rows].astype(np.int16) + offsets, 0, 255).astype(np.uint8)
         
         # Color bleeding
         img_array[:, :, 0] = np.roll(img_array[:, :, 0], 1, axis=1)  # Red shift
         
         # Reduce saturation slightly
-        img = Image.fromarray(img_array.astype(np.uint8))
+        img = Image.fromarray(img_array)
         enhancer = ImageEnhance.Color(img)
         return enhancer.enhance(0.8)
     
     def _apply_film_effect(self, img):
         """Apply film grain and color effect"""
-        img_array = np.array(img)
-        
-        # Add film grain
-        grain = np.random.normal(0, 15, img_array.shape)
-        img_array = np.clip(img_array + grain, 0, 255)
+        # Add film grain; the float32 grain buffer becomes the working image
+        source = np.asarray(img)
+        img_array = self._rng.standard_normal(source.shape, dtype=np.float32)
+        img_array *= 15
+        img_array += source
+        np.clip(img_array, 0, 255, out=img_array)
         
-        # Slight color temperature shift
-        img_array[:, :, 0] = np.clip(img_array[:, :, 0] * 1.1, 0, 255)  # Warm reds
-        img_array[:, :, 2] = np.clip(img_array[:, :, 2] * 0.9, 0, 255)  # Cool blues
+        # Slight color temperature shift: warm reds, cool blues
+        img_array *= np.array([1.1, 1.0, 0.9], dtype=np.float32)
+        np.minimum(img_array, 255, out=img_array)
         
         return Image.fromarray(img_array.astype(np.uint8))
     
     def _apply_sepia_effect(self, img):
         """Apply sepia tone effect"""
-        img_array = np.array(img).astype(np.float64)
-        
-        # Sepia transformation matrix
-        sepia_filter = np.array([
-            [0.393, 0.769, 0.189],
-            [0.349, 0.686, 0.168],
-            [0.272, 0.534, 0.131]
-        ])
-        
-        sepia_img = img_array.dot(sepia_filter.T)
-        sepia_img = np.clip(sepia_img, 0, 255)
-        
-        return Image.fromarray(sepia_img.astype(np.uint8))
+        return Image.fromarray(self._sepia_arr(np.asarray(img)))
     
     def _apply_gamma_correction(self, img, gamma):
         """Apply gamma correction"""
-        img_array = np.array(img).astype(np.float64) / 255.0
-        corrected = np.power(img_array, gamma)
-        return Image.fromarray((corrected * 255).astype(np.uint8))
+        # Per-level table with the same float64 power and truncation, applied to every channel
+        levels = np.arange(256, dtype=np.float64) / 255.0
+        gamma_lut = (np.power(levels, gamma) * 255).astype(np.uint8)
+        return Image.fromarray(self._map_levels(np.asarray(img), gamma_lut))
     
     def _adjust_hue(self, img, shift):
         """Adjust hue by shift degrees"""
         img_array = np.array(img)
         
-        # Convert to HSV
-        from PIL import ImageEnhance
-        import colorsys
-        
         # Simple hue shift by adjusting color channels
         shift_factor = shift / 360.0
         
-        # Rotate color channels slightly
+        # Rotate color channels slightly: boost red, cut green, each as a per-level table
         if shift > 0:
-            r, g, b = img_array[:,:,0], img_array[:,:,1], img_array[:,:,2]
-            img_array[:,:,0] = np.clip(r * (1 + shift_factor), 0, 255)
-            img_array[:,:,1] = np.clip(g * (1 - shift_factor * 0.5), 0, 255)
+            levels = np.arange(256, dtype=np.float64)
+            red_lut = np.clip(levels * (1 + shift_factor), 0, 255).astype(np.uint8)
+            green_lut = np.clip(levels * (1 - shift_factor * 0.5), 0, 255).astype(np.uint8)
+            img_array[:, :, 0] = self._map_levels(img_array[:, :, 0], red_lut)
+            img_array[:, :, 1] = self._map_levels(img_array[:, :, 1], green_lut)
         
-        return Image.fromarray(img_array.astype(np.uint8))
+        return Image.fromarray(img_array)
     
     def _apply_vignette(self, img, strength):
         """Apply vignette effect"""
         img_array = np.array(img)
         height, width = img_array.shape[:2]
         
-        # Create vignette mask
-        Y, X = np.ogrid[:height, :width]
-        center_x, center_y = width // 2, height // 2
+        # Apply to all color channels in one broadcast multiply, truncating back into uint8
+        vignette = _vignette_mask(height, width, strength)
+        rgb = img_array[:, :, :3]
+        np.multiply(rgb, vignette[:, :, np.newaxis], out=rgb, casting='unsafe')
         
-        # Distance from center
-        dist_from_center = np.sqrt((X - center_x)**2 + (Y - center_y)**2)
-        max_dist = np.sqrt(center_x**2 + center_y**2)
-        
-        # Create vignette
-        vignette = 1 - (dist_from_center / max_dist) * strength
-        vignette = np.clip(vignette, 0, 1)
-        
-        # Apply to all channels
-        for i in range(3):
-            img_array[:, :, i] = img_array[:, :, i] * vignette
-        
-        return Image.fromarray(img_array.astype(np.uint8))
+        return Image.fromarray(img_array)
     
     def _apply_fisheye_effect(self, img, strength):
         """Apply fisheye lens distortion"""
         width, height = img.size
-        img_array = np.array(img)
-        
-        # Create coordinate grids
-        x, y = np.meshgrid(np.arange(width), np.arange(height))
-        
-        # Center coordinates
-        cx, cy = width // 2, height // 2
+        img_array = np.asarray(img)
+        map_x, map_y = _fisheye_maps(height, width, strength)
         
-        # Convert to polar coordinates
-        dx, dy = x - cx, y - cy
-        r = np.sqrt(dx**2 + dy**2)
-        max_r = min(cx, cy)
-        
-        # Apply fisheye transformation
-        r_new = r * (1 + strength * (r / max_r)**2)
-        
-        # Convert back to cartesian
-        theta = np.arctan2(dy, dx)
-        x_new = cx + r_new * np.cos(theta)
-        y_new = cy + r_new * np.sin(theta)
-        
-        # Clip coordinates
-        x_new = np.clip(x_new, 0, width - 1).astype(int)
-        y_new = np.clip(y_new, 0, height - 1).astype(int)
-        
-        # Map pixels
-        result = np.zeros_like(img_array)
-        result[y, x] = img_array[y_new, x_new]
+        if cv2 is not None:
+            # Bilinear SIMD gather; the maps are already clamped to the frame
+            result = cv2.remap(img_array, map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+        else:
+            result = img_array[map_y.astype(np.intp), map_x.astype(np.intp)]
         
         return Image.fromarray(result)
     
@@ -789,14 +1293,12 @@ class ImageProcessor:
     
     def _apply_cartoon_effect(self, img):
         """Apply cartoon effect"""
-        img_array = np.array(img)
-        
-        # Reduce colors (posterize)
-        img_array = (img_array // 32) * 32
+        # Reduce colors (posterize): clearing the low 5 bits is (x // 32) * 32 for uint8
+        img_array = np.bitwise_and(np.asarray(img), 0xE0)
         
         # Apply slight blur
         from PIL import ImageFilter
-        img = Image.fromarray(img_array.astype(np.uint8))
+        img = Image.fromarray(img_array)
         blurred = img.filter(ImageFilter.GaussianBlur(radius=1))
         
         # Enhance contrast
@@ -806,37 +1308,42 @@ class ImageProcessor:
     def _apply_thermal_effect(self, img):
         """Apply thermal imaging effect"""
         # Convert to grayscale
-        gray = img.convert('L')
-        gray_array = np.array(gray)
-        
-        # Create thermal color map
-        thermal = np.zeros((gray_array.shape[0], gray_array.shape[1], 3), dtype=np.uint8)
+        gray_array = np.asarray(img.convert('L'))
         
-        # Map grayscale to thermal colors (blue to red)
-        thermal[:, :, 0] = gray_array  # Red channel
-        thermal[:, :, 1] = 255 - gray_array  # Green channel
-        thermal[:, :, 2] = 255 - gray_array  # Blue channel
-        
-        return Image.fromarray(thermal)
+        # Map grayscale to thermal colors (blue to red): green and blue share one inverted plane
+        inverted = 255 - gray_array
+        return self._merge_channels(gray_array, inverted, inverted)
     
     def _apply_night_vision_effect(self, img):
         """Apply night vision effect"""
         # Convert to grayscale
-        gray = img.convert('L')
+        gray_array = np.asarray(img.convert('L'))
         
-        # Convert back to RGB with green tint
-        rgb_array = np.array(gray.convert('RGB'))
-        rgb_array[:, :, 0] = rgb_array[:, :, 0] * 0.3  # Reduce red
-        rgb_array[:, :, 1] = rgb_array[:, :, 1] * 1.5  # Enhance green
-        rgb_array[:, :, 2] = rgb_array[:, :, 2] * 0.3  # Reduce blue
+        # Green tint as per-level tables: reduce red and blue, enhance green
+        levels = np.arange(256, dtype=np.float32)
+        red_blue_lut = (levels * 0.3).astype(np.uint8)
+        green_lut = np.clip(levels * 1.5, 0, 255).astype(np.uint8)
+        red_blue = self._map_levels(gray_array, red_blue_lut)
+        green = self._map_levels(gray_array, green_lut)
         
-        rgb_array = np.clip(rgb_array, 0, 255)
+        # Add scanlines: every 4th row is the tinted value dimmed a further 20%
+        scanlines = gray_array[::4]
+        red_blue[::4] = self._map_levels(scanlines, (red_blue_lut * np.float32(0.8)).astype(np.uint8))
+        green[::4] = self._map_levels(scanlines, (green_lut * np.float32(0.8)).astype(np.uint8))
         
-        # Add scanlines
-        for i in range(0, rgb_array.shape[0], 4):
-            rgb_array[i] = rgb_array[i] * 0.8
-        
-        return Image.fromarray(rgb_array.astype(np.uint8))
+        return self._merge_channels(red_blue, green, red_blue)
+    
+    def _map_levels(self, plane, lut):
+        """Map a single uint8 plane through a 256-entry uint8 table"""
+        if cv2 is not None:
+            return cv2.LUT(plane, lut)
+        return lut[plane]
+    
+    def _merge_channels(self, red, green, blue):
+        """Interleave three uint8 planes into an RGB image"""
+        # Contiguous planes wrap as 'L' images without a copy, and Image.merge packs them straight
+        # into PIL's pixel storage: one pass, where an (H, W, 3) array needs a second on fromarray
+        return Image.merge('RGB', [Image.fromarray(np.ascontiguousarray(plane)) for plane in (red, green, blue)])
     
     def _get_dynamic_variation(self, platform):
         """Get dynamic variation based on time and randomization to prevent pattern detection"""
@@ -846,24 +1353,18 @@ class ImageProcessor:
         # Apply batch processing protection
         variation_seed = self._apply_batch_protection(variation_seed, platform)
         
-        variations = {
-            'tiktok': {
-                'type': variation_seed % 5,
-                'intensity': random.uniform(0.15, 0.35),  # Much more subtle
-                'noise_level': random.randint(1, 3),      # Ultra-minimal noise
-                'color_shift': random.uniform(0.005, 0.015), # Micro color shifts
-                'frequency_bands': random.choice(['low', 'mid', 'mixed']),
-                'perturbation_strength': random.uniform(0.005, 0.015)  # Ultra-subtle
-            },
-            'instagram': {
+        # Only the requested platform's values are drawn; unknown platforms get TikTok's
+        if platform == 'instagram':
+            return {
                 'type': variation_seed % 4,
                 'intensity': random.uniform(0.12, 0.28),  # Subtle
                 'noise_level': random.randint(1, 3),      # Ultra-minimal noise
                 'color_shift': random.uniform(0.008, 0.018),
                 'frequency_bands': random.choice(['low', 'mid']),
                 'perturbation_strength': random.uniform(0.003, 0.012)
-            },
-            'youtube': {
+            }
+        elif platform == 'youtube':
+            return {
                 'type': variation_seed % 4,
                 'intensity': random.uniform(0.10, 0.25),  # Very subtle
                 'noise_level': random.randint(1, 2),      # Ultra-minimal noise
@@ -871,69 +1372,70 @@ class ImageProcessor:
                 'frequency_bands': random.choice(['mid', 'mixed']),
                 'perturbation_strength': random.uniform(0.002, 0.008)
             }
+        return {
+            'type': variation_seed % 5,
+            'intensity': random.uniform(0.15, 0.35),  # Much more subtle
+            'noise_level': random.randint(1, 3),      # Ultra-minimal noise
+            'color_shift': random.uniform(0.005, 0.015), # Micro color shifts
+            'frequency_bands': random.choice(['low', 'mid', 'mixed']),
+            'perturbation_strength': random.uniform(0.005, 0.015)  # Ultra-subtle
         }
-        
-        return variations.get(platform, variations['tiktok'])
     
     def _apply_adversarial_perturbations(self, img, variation):
         """Apply FGS-Audio inspired adversarial perturbations for images"""
-        img_array = np.array(img).astype(np.float32)
+        return Image.fromarray(self._adversarial_arr(np.asarray(img), variation))
+    
+    def _adversarial_arr(self, img_array, variation):
+        """Return a perturbed uint8 copy of an RGB array"""
+        img_array = img_array.astype(np.float32)
         height, width, channels = img_array.shape
         
         # Generate content-adaptive adversarial perturbations
         perturbation_strength = variation['perturbation_strength']
         
         # Create gradient-based perturbations (simplified version of adversarial attacks)
-        for c in range(channels):
-            # Apply different perturbation patterns based on variation type
-            if variation['type'] == 0:
-                # Horizontal gradient perturbations
-                gradient = np.linspace(-perturbation_strength, perturbation_strength, width)
-                perturbation = np.tile(gradient, (height, 1)) * 255
-            elif variation['type'] == 1:
-                # Vertical gradient perturbations
-                gradient = np.linspace(-perturbation_strength, perturbation_strength, height)
-                perturbation = np.tile(gradient.reshape(-1, 1), (1, width)) * 255
-            elif variation['type'] == 2:
-                # Diagonal perturbations
-                x, y = np.meshgrid(np.arange(width), np.arange(height))
-                perturbation = ((x + y) % 17) * perturbation_strength * 255 / 17
-            elif variation['type'] == 3:
-                # Ultra-subtle random perturbations (no visible patterns)
-                perturbation = np.random.normal(0, perturbation_strength * 50, (height, width))
-            else:
-                # Ultra-subtle random noise perturbations
-                perturbation = np.random.normal(0, perturbation_strength * 50, (height, width))
-            
-            # Apply perturbation to channel
-            img_array[:, :, c] += perturbation
+        # Patterned perturbations are identical for every channel and broadcast over them
+        if variation['type'] == 0:
+            # Horizontal gradient perturbations
+            gradient = np.linspace(-perturbation_strength, perturbation_strength, width, dtype=np.float32)
+            img_array += (gradient * 255)[np.newaxis, :, np.newaxis]
+        elif variation['type'] == 1:
+            # Vertical gradient perturbations
+            gradient = np.linspace(-perturbation_strength, perturbation_strength, height, dtype=np.float32)
+            img_array += (gradient * 255)[:, np.newaxis, np.newaxis]
+        elif variation['type'] == 2:
+            # Diagonal perturbations
+            diagonal = _diagonal_pattern(height, width) * np.float32(perturbation_strength * 255 / 17)
+            img_array += diagonal[:, :, np.newaxis]
+        else:
+            # Ultra-subtle random noise perturbations (no visible patterns), independent per channel
+            perturbation = self._rng.standard_normal((height, width, channels), dtype=np.float32)
+            perturbation *= perturbation_strength * 50
+            img_array += perturbation
         
-        img_array = np.clip(img_array, 0, 255)
-        return Image.fromarray(img_array.astype(np.uint8))
+        np.clip(img_array, 0, 255, out=img_array)
+        return img_array.astype(np.uint8)
     
     def _apply_reversible_steganography(self, img, variation):
         """Apply reversible adversarial steganography with content-adaptive changes"""
-        img_array = np.array(img)
+        return Image.fromarray(self._reversible_stego_arr(np.array(img), variation))
+    
+    def _reversible_stego_arr(self, img_array, variation):
+        """Embed content-adaptive LSB changes into a uint8 RGB array in place"""
         height, width, channels = img_array.shape
         
         # Content-adaptive LSB modification based on image texture
-        from scipy import ndimage
-        
         # Detect texture regions for adaptive embedding
-        gray = np.mean(img_array, axis=2)
-        gradient_magnitude = ndimage.sobel(gray)
+        gradient_magnitude = self._mean_sobel_x(img_array)
         texture_mask = gradient_magnitude > np.percentile(gradient_magnitude, 70)
         
         # Apply LSB modifications primarily in textured regions
         for c in range(channels):
             channel = img_array[:, :, c].copy()
             
-            # Generate pseudo-random pattern based on variation
-            np.random.seed(variation['type'] + c)
-            modification_pattern = np.random.randint(0, 4, (height, width))
-            
+            # Pseudo-random pattern based on variation; seeded, so the same for every call
             # Apply modifications only where texture mask allows
-            modification_mask = texture_mask & (modification_pattern == 0)
+            modification_mask = texture_mask & _embedding_slots(variation['type'] + c, height, width)
             
             # Modify LSB in selected regions
             channel[modification_mask] = (channel[modification_mask] & 0xFE) | (variation['type'] % 2)
@@ -944,89 +1446,77 @@ class ImageProcessor:
             
             img_array[:, :, c] = channel
         
-        return Image.fromarray(img_array)
+        return img_array
     
     def _apply_hybrid_dct_manipulation(self, img, variation):
         """Apply hybrid DCT + GAN inspired frequency domain manipulation"""
-        img_array: NDArray[Any] = np.array(img)
+        return Image.fromarray(self._hybrid_dct_arr(np.asarray(img), variation))
+    
+    def _hybrid_dct_arr(self, img_array: NDArray[Any], variation) -> NDArray[Any]:
+        """Return a uint8 copy of an RGB array with its 8x8 DCT bands perturbed"""
         height, width, channels = img_array.shape
         
-        # Process in DCT domain (8x8 blocks like JPEG)
-        from scipy.fft import dctn, idctn
-        
         # Pad image to ensure divisibility by 8
         pad_h = (8 - height % 8) % 8
         pad_w = (8 - width % 8) % 8
         padded_img: NDArray[Any] = np.pad(img_array, ((0, pad_h), (0, pad_w), (0, 0)), mode='edge')
         new_height, new_width = padded_img.shape[:2]
         
-        for c in range(channels):
-            channel: NDArray[Any] = padded_img[:, :, c].astype(np.float32)
-            
-            # Process in 8x8 DCT blocks
-            for i in range(0, new_height - 7, 8):
-                for j in range(0, new_width - 7, 8):
-                    block: NDArray[Any] = channel[i:i+8, j:j+8]
-                    
-                    # Apply DCT
-                    dct_block: NDArray[Any] = np.asarray(dctn(block, norm='ortho'))
-                    
-                    # Frequency band manipulation based on variation
-                    if variation['frequency_bands'] == 'low':
-                        # Modify low frequency coefficients
-                        noise: NDArray[Any] = np.random.uniform(-0.5, 0.5, (3, 3)) * variation['intensity']
-                        low_freq_slice = dct_block[0:3, 0:3]
-                        dct_block[0:3, 0:3] = low_freq_slice + noise
-                    elif variation['frequency_bands'] == 'mid':
-                        # Modify mid frequency coefficients
-                        noise: NDArray[Any] = np.random.uniform(-0.8, 0.8, (4, 4)) * variation['intensity']
-                        mid_freq_slice = dct_block[2:6, 2:6]
-                        dct_block[2:6, 2:6] = mid_freq_slice + noise
-                    elif variation['frequency_bands'] == 'high':
-                        # Modify high frequency coefficients
-                        noise: NDArray[Any] = np.random.uniform(-1.2, 1.2, (3, 3)) * variation['intensity']
-                        high_freq_slice = dct_block[5:8, 5:8]
-                        dct_block[5:8, 5:8] = high_freq_slice + noise
-                    else:  # mixed
-                        # Modify across all bands with different weights
-                        noise_low: NDArray[Any] = np.random.uniform(-0.3, 0.3, (3, 3)) * variation['intensity']
-                        noise_mid: NDArray[Any] = np.random.uniform(-0.6, 0.6, (3, 3)) * variation['intensity']
-                        noise_high: NDArray[Any] = np.random.uniform(-0.9, 0.9, (2, 2)) * variation['intensity']
-                        low_slice = dct_block[0:3, 0:3]
-                        mid_slice = dct_block[3:6, 3:6]
-                        high_slice = dct_block[6:8, 6:8]
-                        dct_block[0:3, 0:3] = low_slice + noise_low
-                        dct_block[3:6, 3:6] = mid_slice + noise_mid
-                        dct_block[6:8, 6:8] = high_slice + noise_high
-                    
-                    # Apply inverse DCT
-                    modified_block: NDArray[Any] = np.asarray(idctn(dct_block, norm='ortho'))
-                    clipped_block: NDArray[Any] = np.clip(modified_block, 0, 255)
-                    channel[i:i+8, j:j+8] = clipped_block
-            
-            padded_img[:, :, c] = channel
-        
-        # Remove padding
-        result = padded_img[:height, :width, :]
-        return Image.fromarray(result.astype(np.uint8))
+        # Process in DCT domain as one (channels, rows, cols, 8, 8) stack of 8x8 blocks like JPEG
+        blocks = padded_img.reshape(new_height // 8, 8, new_width // 8, 8, channels).transpose(4, 0, 2, 1, 3)
+        dct_blocks: NDArray[Any] = np.asarray(dctn(blocks.astype(np.float32), axes=(-2, -1), norm='ortho'))
+        batch = dct_blocks.shape[:3]
+        intensity = variation['intensity']
+        
+        # Frequency band manipulation based on variation
+        if variation['frequency_bands'] == 'low':
+            # Modify low frequency coefficients
+            dct_blocks[..., 0:3, 0:3] += self._rng.uniform(-0.5, 0.5, (*batch, 3, 3)) * intensity
+        elif variation['frequency_bands'] == 'mid':
+            # Modify mid frequency coefficients
+            dct_blocks[..., 2:6, 2:6] += self._rng.uniform(-0.8, 0.8, (*batch, 4, 4)) * intensity
+        elif variation['frequency_bands'] == 'high':
+            # Modify high frequency coefficients
+            dct_blocks[..., 5:8, 5:8] += self._rng.uniform(-1.2, 1.2, (*batch, 3, 3)) * intensity
+        else:  # mixed
+            # Modify across all bands with different weights
+            dct_blocks[..., 0:3, 0:3] += self._rng.uniform(-0.3, 0.3, (*batch, 3, 3)) * intensity
+            dct_blocks[..., 3:6, 3:6] += self._rng.uniform(-0.6, 0.6, (*batch, 3, 3)) * intensity
+            dct_blocks[..., 6:8, 6:8] += self._rng.uniform(-0.9, 0.9, (*batch, 2, 2)) * intensity
+        
+        # Apply inverse DCT
+        modified_blocks: NDArray[Any] = np.asarray(idctn(dct_blocks, axes=(-2, -1), norm='ortho'))
+        np.clip(modified_blocks, 0, 255, out=modified_blocks)
+        
+        # Back to image layout and remove padding
+        result = modified_blocks.transpose(1, 3, 2, 4, 0).reshape(new_height, new_width, channels)[:height, :width]
+        return result.astype(np.uint8)
     
     def _apply_triple_stage_processing(self, img, variation):
         """Apply triple-stage robust processing inspired by audio research"""
+        return Image.fromarray(self._triple_stage_arr(np.asarray(img), variation))
+    
+    def _triple_stage_arr(self, img_array, variation):
+        """Run the three robust processing stages on a uint8 RGB array"""
         
         # Stage 1: Psychoacoustic model inspired visual processing
-        img = self._apply_psycho_visual_processing(img, variation)
+        img_array = self._psycho_visual_arr(img_array, variation)
         
         # Stage 2: Robust embedding domain (transform domain manipulation)
-        img = self._apply_robust_embedding_domain(img, variation)
+        img_array = self._robust_embedding_arr(img_array, variation)
         
         # Stage 3: Error correction and resilience
-        img = self._apply_error_correction_processing(img, variation)
+        img_array = self._error_correction_arr(img_array, variation)
         
-        return img
+        return img_array
     
     def _apply_psycho_visual_processing(self, img, variation):
         """Stage 1: Psychoacoustic model inspired processing for visual domain"""
-        img_array = np.array(img).astype(np.float32)
+        return Image.fromarray(self._psycho_visual_arr(np.asarray(img), variation))
+    
+    def _psycho_visual_arr(self, img_array, variation):
+        """Return a uint8 copy of an RGB array with luminance-masked noise"""
+        img_array = img_array.astype(np.float32)
         
         # Human visual system inspired masking
         # Apply stronger modifications in areas where human vision is less sensitive
@@ -1035,22 +1525,24 @@ class ImageProcessor:
         luminance = 0.299 * img_array[:, :, 0] + 0.587 * img_array[:, :, 1] + 0.114 * img_array[:, :, 2]
         
         # Create masking based on local luminance adaptation
-        from scipy import ndimage
         local_mean = ndimage.uniform_filter(luminance, size=8)
         visual_mask = np.abs(luminance - local_mean) / (local_mean + 1)
         
-        # Apply very subtle adaptive modifications
-        for c in range(3):
-            noise_strength = variation['noise_level'] * visual_mask / 5000.0  # Ultra-subtle
-            channel_noise = np.random.normal(0, 0.1, img_array[:, :, c].shape) * noise_strength.reshape(luminance.shape)
-            img_array[:, :, c] += channel_noise
+        # Apply very subtle adaptive modifications, one draw for all channels
+        noise_strength = variation['noise_level'] * visual_mask / 5000.0  # Ultra-subtle
+        channel_noise = self._rng.standard_normal(img_array.shape, dtype=np.float32)
+        channel_noise *= (0.1 * noise_strength)[:, :, np.newaxis]
+        img_array += channel_noise
         
         img_array = np.clip(img_array, 0, 255)
-        return Image.fromarray(img_array.astype(np.uint8))
+        return img_array.astype(np.uint8)
     
     def _apply_robust_embedding_domain(self, img, variation):
         """Stage 2: Robust embedding in transform domain"""
-        img_array = np.array(img)
+        return Image.fromarray(self._robust_embedding_arr(np.asarray(img), variation))
+    
+    def _robust_embedding_arr(self, img_array, variation):
+        """Return a uint8 copy of an RGB array with chroma noise added in YUV space"""
         
         # Apply color space transformation for robust embedding
         # Convert RGB to YUV for better robustness
@@ -1068,8 +1560,8 @@ class ImageProcessor:
         # Apply very subtle modifications in YUV space (more robust to compression)
         if variation['intensity'] > 0.1:
             # Modify U and V channels (chrominance) which are less perceptible
-            yuv_img[:, :, 1] += np.random.uniform(-0.5, 0.5, yuv_img[:, :, 1].shape) * variation['color_shift']
-            yuv_img[:, :, 2] += np.random.uniform(-0.5, 0.5, yuv_img[:, :, 2].shape) * variation['color_shift']
+            chroma_noise = self._rng.random((*yuv_img.shape[:2], 2), dtype=np.float32) - 0.5
+            yuv_img[:, :, 1:] += chroma_noise * variation['color_shift']
         
         # Convert back to RGB
         rgb_matrix = np.linalg.inv(yuv_matrix)
@@ -1078,11 +1570,14 @@ class ImageProcessor:
         rgb_img = rgb_img.T.reshape(img_array.shape)
         
         rgb_img = np.clip(rgb_img, 0, 255)
-        return Image.fromarray(rgb_img.astype(np.uint8))
+        return rgb_img.astype(np.uint8)
     
     def _apply_error_correction_processing(self, img, variation):
         """Stage 3: Error correction and resilience processing"""
-        img_array = np.array(img)
+        return Image.fromarray(self._error_correction_arr(np.asarray(img), variation))
+    
+    def _error_correction_arr(self, img_array, variation):
+        """Return a uint8 copy of an RGB array with redundant micro-adjustments"""
         
         # Apply redundant modifications for error correction
         # Multiple small changes that survive compression better than single large changes
@@ -1093,20 +1588,25 @@ class ImageProcessor:
             
             # Apply very subtle micro-adjustments
             if iteration == 0:
-                # Brightness micro-adjustments (barely noticeable)
-                img_array = img_array + np.random.uniform(-adjustment_strength*0.3, adjustment_strength*0.3, img_array.shape)
+                # Brightness micro-adjustments (barely noticeable); the jitter buffer becomes the float32 working image
+                jitter = self._rng.random(img_array.shape, dtype=np.float32)
+                jitter -= 0.5
+                jitter *= adjustment_strength * 0.6
+                img_array = np.add(jitter, img_array, out=jitter)
             elif iteration == 1:
                 # Contrast micro-adjustments (very subtle)
                 mean_brightness = np.mean(img_array, axis=(0, 1), keepdims=True)
-                img_array = (img_array - mean_brightness) * (1 + adjustment_strength * 0.02) + mean_brightness
+                img_array -= mean_brightness
+                img_array *= 1 + adjustment_strength * 0.02
+                img_array += mean_brightness
             else:
-                # Color balance micro-adjustments (imperceptible)
-                img_array[:, :, 0] *= (1 + adjustment_strength * 0.01)
-                img_array[:, :, 1] *= (1 - adjustment_strength * 0.01)
-                img_array[:, :, 2] *= (1 + adjustment_strength * 0.01)
+                # Color balance micro-adjustments (imperceptible), all three channels in one pass
+                img_array *= np.array([1 + adjustment_strength * 0.01,
+                                       1 - adjustment_strength * 0.01,
+                                       1 + adjustment_strength * 0.01], dtype=np.float32)
         
-        img_array = np.clip(img_array, 0, 255)
-        return Image.fromarray(img_array.astype(np.uint8))
+        np.clip(img_array, 0, 255, out=img_array)
+        return img_array.astype(np.uint8)
     
     def _apply_tiktok_specific_evasion(self, img, variation):
         """Apply TikTok-specific algorithm evasion based on platform analysis"""
@@ -1130,27 +1630,15 @@ class ImageProcessor:
         rotation_angle = random.uniform(-0.05, 0.05) * variation['intensity']  # Much smaller rotation
         img = img.rotate(rotation_angle, expand=False, fillcolor=(0, 0, 0))
         
-        # Apply very subtle noise pattern 
-        img_array = np.array(img)
-        
-        # TikTok-specific ultra-subtle noise pattern
-        noise_pattern = np.random.normal(0, variation['noise_level'] * 0.02, img_array.shape)  # Ultra-minimal noise
-        
-        # Apply extremely minimal noise strategically
-        from scipy import ndimage
-        edges = ndimage.sobel(np.mean(img_array, axis=2))
-        edges_3d = np.stack([edges] * 3, axis=2)
-        adaptive_noise = noise_pattern * (1 + edges_3d / 255.0 * 0.01)  # Extremely subtle adaptive noise
-        
-        img_array = img_array + adaptive_noise
-        img_array = np.clip(img_array, 0, 255)
-        
-        return Image.fromarray(img_array.astype(np.uint8))
+        # TikTok-specific ultra-subtle noise pattern, applied extremely minimally and strategically
+        return self._apply_edge_adaptive_noise(img, variation['noise_level'] * 0.02, 0.01)
     
     def _apply_instagram_advanced_preset(self, input_path, output_path):
         """Instagram: Research-based 2025 anti-algorithm system optimized for Reels 9:16 format"""
         try:
             with Image.open(input_path) as img:
+                # Let libjpeg downscale during decode while keeping at least 1080x1920 for the Reels crop
+                img.draft('RGB', (1080, 1920))
                 if img.mode != 'RGB':
                     img = img.convert('RGB')
                 
@@ -1161,10 +1649,10 @@ class ImageProcessor:
                 variation = self._get_dynamic_variation('instagram')
                 
                 # Apply the same advanced 5-layer system
-                img = self._apply_adversarial_perturbations(img, variation)
-                img = self._apply_reversible_steganography(img, variation)
-                img = self._apply_hybrid_dct_manipulation(img, variation)
-                img = self._apply_triple_stage_processing(img, variation)
+                arr = self._adversarial_arr(np.asarray(img), variation)
+                arr = self._reversible_stego_arr(arr, variation)
+                arr = self._hybrid_dct_arr(arr, variation)
+                img = Image.fromarray(self._triple_stage_arr(arr, variation))
                 img = self._apply_instagram_specific_evasion(img, variation)
                 
                 # Apply metadata manipulation for maximum evasion
@@ -1172,7 +1660,7 @@ class ImageProcessor:
                 
                 # Dynamic quality for Instagram
                 quality = random.randint(80, 90)
-                img.save(output_path, 'JPEG', quality=quality, optimize=True)
+                self._save_jpeg(img, output_path, quality=quality)
                 
                 # Apply format conversion chain for additional evasion
                 output_path = self._apply_format_conversion_chain(output_path, variation)
@@ -1194,10 +1682,10 @@ class ImageProcessor:
                 variation = self._get_dynamic_variation('youtube')
                 
                 # Apply the same advanced 5-layer system
-                img = self._apply_adversarial_perturbations(img, variation)
-                img = self._apply_reversible_steganography(img, variation)
-                img = self._apply_hybrid_dct_manipulation(img, variation)
-                img = self._apply_triple_stage_processing(img, variation)
+                arr = self._adversarial_arr(np.asarray(img), variation)
+                arr = self._reversible_stego_arr(arr, variation)
+                arr = self._hybrid_dct_arr(arr, variation)
+                img = Image.fromarray(self._triple_stage_arr(arr, variation))
                 img = self._apply_youtube_specific_evasion(img, variation)
                 
                 # Apply metadata manipulation for maximum evasion
@@ -1205,7 +1693,7 @@ class ImageProcessor:
                 
                 # Dynamic quality for YouTube
                 quality = random.randint(75, 85)
-                img.save(output_path, 'JPEG', quality=quality, optimize=True)
+                self._save_jpeg(img, output_path, quality=quality)
                 
                 # Apply format conversion chain for additional evasion
                 output_path = self._apply_format_conversion_chain(output_path, variation)
@@ -1224,35 +1712,21 @@ class ImageProcessor:
         # 3. Face and object recognition
         # 4. Engagement prediction based on visual appeal
         
-        # Enhance for Instagram's preference for vibrant content
-        enhancer = ImageEnhance.Color(img)
+        # Enhance for Instagram's preference for vibrant content, with the saturation boost
+        # folded in: both blend against the same greyscale, so the factors multiply
         color_factor = 1.0 + (variation['color_shift'] * 3)  # Instagram loves vibrant colors
-        img = enhancer.enhance(color_factor)
-        
-        # Apply saturation boost specifically for Instagram
-        enhancer = ImageEnhance.Color(img)
         saturation_factor = 1.0 + (variation['intensity'] * 0.4)
-        img = enhancer.enhance(saturation_factor)
+        enhancer = ImageEnhance.Color(img)
+        img = enhancer.enhance(color_factor * saturation_factor)
         
-        # Apply slight contrast enhancement
-        enhancer = ImageEnhance.Contrast(img)
+        # Apply slight contrast enhancement as a lookup table; the factor is random per
+        # variation, so the table is not worth caching
         contrast_factor = 1.0 + (variation['intensity'] * 0.2)
-        img = enhancer.enhance(contrast_factor)
+        lut = self._affine_lut(contrast=contrast_factor, mean=self._contrast_mean(img), cache=False)
+        img = Image.fromarray(self._apply_lut_arr(np.asarray(img), lut))
         
-        # Very subtle Instagram-specific noise pattern
-        img_array = np.array(img)
-        noise_pattern = np.random.normal(0, variation['noise_level'] * 0.08, img_array.shape)  # Much less noise
-        
-        # Apply minimal noise with Instagram's characteristic pattern
-        from scipy import ndimage
-        edges = ndimage.sobel(np.mean(img_array, axis=2))
-        edges_3d = np.stack([edges] * 3, axis=2)
-        instagram_noise = noise_pattern * (1 + edges_3d / 255.0 * 0.03)  # Much less adaptive noise
-        
-        img_array = img_array + instagram_noise
-        img_array = np.clip(img_array, 0, 255)
-        
-        return Image.fromarray(img_array.astype(np.uint8))
+        # Very subtle Instagram-specific noise pattern with much less adaptive weighting
+        return self._apply_edge_adaptive_noise(img, variation['noise_level'] * 0.08, 0.03)
     
     def _apply_youtube_specific_evasion(self, img, variation):
         """Apply YouTube-specific algorithm evasion"""
@@ -1267,33 +1741,39 @@ class ImageProcessor:
         sharpness_factor = 1.0 + (variation['intensity'] * 0.4)
         img = enhancer.enhance(sharpness_factor)
         
-        # Apply subtle color temperature adjustment
-        img_array = np.array(img).astype(np.float32)
-        
-        # Cool down slightly (YouTube's algorithm preference)
-        img_array[:, :, 0] *= (1 - variation['color_shift'] * 0.1)  # Reduce red slightly
-        img_array[:, :, 2] *= (1 + variation['color_shift'] * 0.1)  # Enhance blue slightly
+        # Apply subtle color temperature adjustment as per-level tables, same float32 truncation
+        # Cool down slightly (YouTube's algorithm preference): reduce red, enhance blue
+        scales = np.array([1 - variation['color_shift'] * 0.1, 1, 1 + variation['color_shift'] * 0.1],
+                          dtype=np.float32)
+        lut = np.clip(np.arange(256, dtype=np.float32) * scales[:, np.newaxis], 0, 255).astype(np.uint8)
         
         # YouTube-specific micro-transformations
         # Apply subtle rotation for pixel disruption
         rotation_angle = random.uniform(-0.2, 0.2) * variation['intensity']
-        img = Image.fromarray(np.clip(img_array, 0, 255).astype(np.uint8))
+        img = Image.fromarray(self._apply_lut_arr(np.asarray(img), lut))
         img = img.rotate(rotation_angle, expand=False, fillcolor=(0, 0, 0))
         
-        # Very subtle YouTube noise pattern 
-        img_array = np.array(img)
-        noise_pattern = np.random.normal(0, variation['noise_level'] * 0.05, img_array.shape)  # Minimal noise
-        
-        # Apply minimal strategic noise
-        from scipy import ndimage
-        edges = ndimage.sobel(np.mean(img_array, axis=2))
-        edges_3d = np.stack([edges] * 3, axis=2)
-        youtube_noise = noise_pattern * (1 + edges_3d / 255.0 * 0.02)  # Very minimal adaptive noise
+        # Very subtle YouTube noise pattern with very minimal adaptive weighting
+        return self._apply_edge_adaptive_noise(img, variation['noise_level'] * 0.05, 0.02)
+    
+    def _mean_sobel_x(self, img_array):
+        """Horizontal Sobel response of the channel mean, as ndimage.sobel(axis=-1) gives it"""
+        gray = img_array.mean(axis=2, dtype=np.float32)
+        if cv2 is not None:
+            return cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3, borderType=cv2.BORDER_REFLECT)
+        return ndimage.sobel(gray)
+    
+    def _apply_edge_adaptive_noise(self, img, sigma, edge_gain):
+        """Add Gaussian noise scaled by 1 + edge / 255 * edge_gain, broadcasting the edge map over channels"""
+        img_array = np.asarray(img)
         
-        img_array = img_array + youtube_noise
-        img_array = np.clip(img_array, 0, 255)
+        noise = self._rng.standard_normal(img_array.shape, dtype=np.float32)
+        noise *= sigma
+        noise *= 1 + self._mean_sobel_x(img_array)[:, :, np.newaxis] * (edge_gain / 255.0)
         
-        return Image.fromarray(img_array.astype(np.uint8))
+        noise += img_array
+        np.clip(noise, 0, 255, out=noise)
+        return Image.fromarray(noise.astype(np.uint8))
     
     def _apply_metadata_evasion(self, img, variation):
         """Apply comprehensive metadata manipulation for maximum detection evasion"""
@@ -1455,38 +1935,25 @@ class ImageProcessor:
     def _apply_batch_protection(self, variation_seed, platform):
         """Prevent pattern detection across multiple uploads in the same session"""
         # Create unique fingerprint for this processing session
-        session_fingerprint = {
-            'platform': platform,
-            'variation_type': variation_seed % 5,
-            'timestamp': int(time.time() / 300)  # 5-minute windows
-        }
+        variation_type = variation_seed % 5
+        timestamp = int(time.time() / 300)  # 5-minute windows
         
         # Check if this combination was used recently
-        recent_similar = [h for h in self.session_history 
-                         if h['platform'] == platform and 
-                         h['variation_type'] == session_fingerprint['variation_type'] and
-                         abs(h['timestamp'] - session_fingerprint['timestamp']) <= 2]
-        
-        # If similar pattern found recently, modify the variation
-        if recent_similar:
+        counts = self._history_counts
+        if any(counts[(platform, variation_type, window)] for window in range(timestamp - 2, timestamp + 3)):
             # Force a different variation type
-            available_types = list(range(5))
-            used_types = [h['variation_type'] for h in recent_similar]
-            available_types = [t for t in available_types if t not in used_types]
-            
-            if available_types:
-                new_type = random.choice(available_types)
-                variation_seed = (variation_seed // 5) * 5 + new_type
-            else:
-                # All types used recently, add random offset
-                variation_seed += random.randint(10, 50)
-        
-        # Add this session to history
-        self.session_history.append(session_fingerprint)
-        
-        # Keep only recent history
-        if len(self.session_history) > self.max_history:
-            self.session_history = self.session_history[-self.max_history:]
+            new_type = random.choice([t for t in range(5) if t != variation_type])
+            variation_seed = (variation_seed // 5) * 5 + new_type
+        
+        # Add this session to history, forgetting the fingerprint the deque is about to drop
+        if len(self.session_history) == self.max_history:
+            oldest = self.session_history[0]
+            counts[oldest] -= 1
+            if not counts[oldest]:
+                del counts[oldest]
+        fingerprint = (platform, variation_type, timestamp)
+        self.session_history.append(fingerprint)
+        counts[fingerprint] += 1
         
         return variation_seed
     
@@ -1522,24 +1989,19 @@ class ImageProcessor:
     def _jpg_png_jpg_chain(self, input_path, variation):
         """JPEG → PNG → JPEG conversion chain"""
         try:
-            # Step 1: JPEG → PNG
-            png_path = input_path.replace('.jpg', '_temp.png').replace('.jpeg', '_temp.png')
+            # Step 1: JPEG → PNG, held in memory rather than a temp file
+            png_buffer = io.BytesIO()
             with Image.open(input_path) as img:
                 # PNG conversion with random compression level
-                img.save(png_path, 'PNG', compress_level=random.randint(1, 9))
+                img.save(png_buffer, 'PNG', compress_level=random.randint(1, 9))
+            png_buffer.seek(0)
             
-            # Step 2: PNG → JPEG with different settings
-            final_path = input_path.replace('_temp.png', '_final.jpg')
-            with Image.open(png_path) as img:
+            # Step 2: PNG → JPEG with different settings, replacing the original file
+            with Image.open(png_buffer) as img:
                 # Convert back to JPEG with randomized settings
                 quality = random.randint(82, 92)
-                img.save(final_path, 'JPEG', quality=quality, optimize=True)
-            
-            # Cleanup temporary PNG
-            os.remove(png_path)
+                self._save_jpeg(img, input_path, quality=quality)
             
-            # Replace original file
-            os.replace(final_path, input_path)
             return input_path
             
         except Exception:
@@ -1548,20 +2010,17 @@ class ImageProcessor:
     def _jpg_bmp_jpg_chain(self, input_path, variation):
         """JPEG → BMP → JPEG conversion chain"""
         try:
-            # Step 1: JPEG → BMP (uncompressed)
-            bmp_path = input_path.replace('.jpg', '_temp.bmp').replace('.jpeg', '_temp.bmp')
+            # Step 1: JPEG → BMP (uncompressed), in memory
+            bmp_buffer = io.BytesIO()
             with Image.open(input_path) as img:
-                img.save(bmp_path, 'BMP')
+                img.save(bmp_buffer, 'BMP')
+            bmp_buffer.seek(0)
             
             # Step 2: BMP → JPEG with different settings
-            final_path = input_path.replace('_temp.bmp', '_final.jpg')
-            with Image.open(bmp_path) as img:
+            with Image.open(bmp_buffer) as img:
                 quality = random.randint(80, 88)
-                img.save(final_path, 'JPEG', quality=quality, optimize=True)
+                self._save_jpeg(img, input_path, quality=quality)
             
-            # Cleanup
-            os.remove(bmp_path)
-            os.replace(final_path, input_path)
             return input_path
             
         except Exception:
@@ -1570,20 +2029,17 @@ class ImageProcessor:
     def _jpg_tiff_jpg_chain(self, input_path, variation):
         """JPEG → TIFF → JPEG conversion chain"""
         try:
-            # Step 1: JPEG → TIFF
-            tiff_path = input_path.replace('.jpg', '_temp.tiff').replace('.jpeg', '_temp.tiff')
+            # Step 1: JPEG → TIFF, in memory
+            tiff_buffer = io.BytesIO()
             with Image.open(input_path) as img:
-                img.save(tiff_path, 'TIFF', compression='lzw')
+                img.save(tiff_buffer, 'TIFF', compression='lzw')
+            tiff_buffer.seek(0)
             
             # Step 2: TIFF → JPEG
-            final_path = input_path.replace('_temp.tiff', '_final.jpg')
-            with Image.open(tiff_path) as img:
+            with Image.open(tiff_buffer) as img:
                 quality = random.randint(79, 89)
-                img.save(final_path, 'JPEG', quality=quality, optimize=True)
+                self._save_jpeg(img, input_path, quality=quality)
             
-            # Cleanup
-            os.remove(tiff_path)
-            os.replace(final_path, input_path)
             return input_path
             
         except Exception:
@@ -1592,26 +2048,25 @@ class ImageProcessor:
     def _quality_conversion_chain(self, input_path, variation):
         """Multiple quality conversion chain"""
         try:
-            # Step 1: Lower quality
-            temp_path1 = input_path.replace('.jpg', '_temp1.jpg').replace('.jpeg', '_temp1.jpg')
+            # Step 1: Lower quality; intermediate generations stay in memory
+            first_pass = io.BytesIO()
             with Image.open(input_path) as img:
                 quality1 = random.randint(70, 85)
-                img.save(temp_path1, 'JPEG', quality=quality1)
+                self._save_jpeg(img, first_pass, quality=quality1)
+            first_pass.seek(0)
             
             # Step 2: Higher quality
-            temp_path2 = input_path.replace('.jpg', '_temp2.jpg').replace('.jpeg', '_temp2.jpg')
-            with Image.open(temp_path1) as img:
+            second_pass = io.BytesIO()
+            with Image.open(first_pass) as img:
                 quality2 = random.randint(85, 95)
-                img.save(temp_path2, 'JPEG', quality=quality2, optimize=True)
+                self._save_jpeg(img, second_pass, quality=quality2)
+            second_pass.seek(0)
             
             # Step 3: Final quality
-            with Image.open(temp_path2) as img:
+            with Image.open(second_pass) as img:
                 final_quality = random.randint(80, 90)
-                img.save(input_path, 'JPEG', quality=final_quality, optimize=True)
+                self._save_jpeg(img, input_path, quality=final_quality)
             
-            # Cleanup
-            os.remove(temp_path1)
-            os.remove(temp_path2)
             return input_path
             
         except Exception:
@@ -1620,26 +2075,36 @@ class ImageProcessor:
     def _compression_conversion_chain(self, input_path, variation):
         """Different compression method chain"""
         try:
-            # Step 1: Save with different compression options
-            temp_path = input_path.replace('.jpg', '_temp.jpg').replace('.jpeg', '_temp.jpg')
+            # Step 1: Save with different compression options, in memory
+            first_pass = io.BytesIO()
             with Image.open(input_path) as img:
                 # Use different subsampling and optimization
                 subsampling = random.choice([0, 1, 2])  # Different chroma subsampling
-                img.save(temp_path, 'JPEG', 
+                img.save(first_pass, 'JPEG', 
                         quality=random.randint(82, 92),
                         optimize=True,
                         subsampling=subsampling)
+            first_pass.seek(0)
             
             # Step 2: Final save with different settings
-            with Image.open(temp_path) as img:
+            with Image.open(first_pass) as img:
                 img.save(input_path, 'JPEG', 
                         quality=random.randint(85, 95),
                         optimize=True,
                         progressive=random.choice([True, False]))
             
-            # Cleanup
-            os.remove(temp_path)
             return input_path
             
         except Exception:
             return input_path
+
+
+_worker_processor = None
+
+
+def _apply_preset_in_worker(input_path, platform):
+    """Apply a preset with this worker process's own ImageProcessor"""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = ImageProcessor()
+    return _worker_processor._apply_preset_to_own_file(input_path, platform)
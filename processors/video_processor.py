@@ -1,20 +1,121 @@
 import ffmpeg
 import tempfile
 import os
-from pathlib import Path
+from collections import Counter, OrderedDict, deque
 import random
 import time
+import datetime
 import math
 import numpy as np
 import subprocess
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import threading
+
+try:
+    import av
+except ImportError:
+    # PyAV is optional; probes go through ffprobe without it
+    av = None
+
+
+_BATCH_JOB_THREADS = 4  # ffmpeg encoder threads per batch job
+# Batch jobs running at once across every VideoProcessor in this process, so that several
+# sessions batching together still keep ffmpeg threads at about one per core
+_batch_slots = threading.BoundedSemaphore(max(1, (os.cpu_count() or _BATCH_JOB_THREADS) // _BATCH_JOB_THREADS))
+
+_FAKE_TIME_SPAN = 730 * 24 * 3600  # Seconds back that fake creation times may reach (2 years)
+
+
+def _stem(path):
+    """Return a path's file name without its last suffix, like Path.stem without building a Path"""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _av_probe(path):
+    """Return the ffprobe fields the presets read, from PyAV in-process instead of an ffprobe run"""
+    with av.open(path) as container:
+        streams = []
+        for stream in container.streams:
+            codec = stream.codec_context
+            info = {'index': stream.index, 'codec_type': stream.type, 'codec_name': codec.name}
+            if stream.type == 'video':
+                # r_frame_rate is libavformat's real base frame rate, which PyAV calls base_rate
+                rate = stream.base_rate or stream.average_rate
+                info.update(width=codec.width, height=codec.height,
+                            r_frame_rate=f'{rate.numerator}/{rate.denominator}' if rate else '0/1')
+            elif stream.type == 'audio':
+                info.update(sample_rate=str(codec.sample_rate), channels=codec.channels)
+            streams.append(info)
+        probe_format = {'format_name': container.format.name, 'nb_streams': len(streams)}
+        if container.duration is not None:
+            probe_format['duration'] = f'{container.duration / av.time_base:.6f}'
+    return {'streams': streams, 'format': probe_format}
+
+
+# NVIDIA's recommended high-quality transcode options (adaptive quantisation, lookahead and
+# B-frames as references); b_ref_mode needs Turing or newer, so they are probed as a set
+_NVENC_QUALITY_PARAMS = {'tune': 'hq', 'spatial-aq': 1, 'temporal-aq': 1, 'rc-lookahead': 20, 'b_ref_mode': 'middle'}
+
+
+@lru_cache(maxsize=None)
+def _nvenc_available(**options):
+    """Return True when FFmpeg can open an h264_nvenc session on this machine with the given options"""
+    # Listing encoders is not enough: builds ship NVENC without a GPU, so try a tiny encode
+    cmd = ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-f', 'lavfi',
+           '-i', 'color=size=256x256:duration=0.1', '-c:v', 'h264_nvenc']
+    for key, value in options.items():
+        cmd.extend([f'-{key}', str(value)])
+    cmd.extend(['-f', 'null', '-'])
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=15)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
 
 class VideoProcessor:
+    _EQ_FOLDABLE = frozenset(('brightness', 'contrast', 'gamma', 'saturation'))  # eq options _eq can merge
+    _EQ_TRANSPARENT = frozenset(('setpts',))  # One-frame-in, one-frame-out timing filters an eq commutes with
+    # (key, low, high) bounds for the TikTok variation's corner offsets and 3x3 channel mix
+    _TIKTOK_PERSPECTIVE = (('x0', 0, 5), ('y0', 0, 5), ('x1', 95, 100), ('y1', 0, 5),
+                           ('x2', 0, 5), ('y2', 95, 100), ('x3', 95, 100), ('y3', 95, 100))
+    _TIKTOK_CHANNEL_MIX = (('rr', 0.98, 1.02), ('rg', -0.01, 0.01), ('rb', -0.01, 0.01),
+                           ('gr', -0.01, 0.01), ('gg', 0.98, 1.02), ('gb', -0.01, 0.01),
+                           ('br', -0.01, 0.01), ('bg', -0.01, 0.01), ('bb', 0.98, 1.02))
+    # (centre frequencies, max |gain|, widths) for the TikTok variation's three audio EQ bands
+    _TIKTOK_EQ_BANDS = (((440, 880, 1320), 0.1, (1, 2)),
+                        ((2200, 4400, 8800), 0.08, (1, 2)),
+                        ((100, 200, 400), 0.05, (2, 3)))
+    
     def __init__(self):
         self.temp_dir = tempfile.gettempdir()
-        self.session_history = []  # Track processing patterns to avoid repetition
+        # Small scratch files (filter scripts) go to RAM-backed /dev/shm when there is one; video
+        # intermediates stay in temp_dir, as /dev/shm is often tiny (64 MB in Docker) and shared
+        self._scratch_dir = '/dev/shm' if os.access('/dev/shm', os.W_OK) else self.temp_dir
         self.max_history = 10      # Remember last 10 processing sessions
+        # Track processing patterns to avoid repetition, as (platform, variation_type, time window)
+        # fingerprints; the counter mirrors the deque so lookups don't scan it
+        self.session_history = deque(maxlen=self.max_history)
+        self._history_counts = Counter()
         self.audio_quality = '192k'  # Default audio quality
+        self.encoder_preset = 'faster'  # Default libx264 preset; about 3x faster than medium at a near-identical CRF quality
         self._encoding_start_time = time.time()  # Initialize encoding timer
+        self._venc = 'h264_nvenc' if _nvenc_available() else 'libx264'  # GPU encoder when one is usable
+        self._nvenc_quality = self._venc == 'h264_nvenc' and _nvenc_available(**_NVENC_QUALITY_PARAMS)
+        # Decode on the same GPU (NVDEC); frames come back to system memory for the CPU-only filters
+        self._hwaccel = 'cuda' if self._venc == 'h264_nvenc' else None
+        self._threads = None  # Encoder thread cap; set in batch workers so concurrent encodes share the cores
+        self._process_pool = None  # Started on the first batch
+        self._probe_cache = OrderedDict()  # (path, mtime, size) -> ffprobe result, LRU order
+        self.max_cached_probes = 32
+        self._process_pool_lock = threading.Lock()
+        self._platform_systems = {
+            'tiktok': self._apply_tiktok_2025_system,
+            'instagram': self._apply_instagram_2025_system,
+            'youtube': self._apply_youtube_2025_system,
+            'youtube_shorts': self._apply_youtube_shorts_2025_system,
+        }
         
         # 2025 ML-Mimicking Parameters
         self.adversarial_params = self._init_adversarial_params()
@@ -22,10 +123,173 @@ class VideoProcessor:
         self.transfer_learning_patterns = self._init_transfer_patterns()
         self.platform_specific_targets = self._init_platform_targets()
     
+    def _encoder_params(self, crf, preset=None, tune='fastdecode'):
+        """Return video encoder options for a libx264 CRF/preset pair, mapped onto NVENC when in use"""
+        preset = preset or self.encoder_preset
+        if self._venc == 'libx264':
+            # Main profile (4:2:0 only, so the pixel format is pinned) with fastdecode, which turns off
+            # CABAC, deblocking and weighted prediction: faster to encode, but files come out larger
+            # at the same CRF. Frame threads on every core (or the batch cap) plus a second lookahead
+            # thread, which x264 otherwise only adds from 12 threads up; slice threading is left off
+            # as it costs quality
+            params = {'vcodec': 'libx264', 'crf': crf, 'preset': preset, 'profile:v': 'main', 'tune': tune,
+                      'pix_fmt': 'yuv420p', 'threads': self._threads or 0, 'x264-params': 'lookahead-threads=2'}
+        else:
+            # Constant-quality VBR; NVENC's cq scale tracks libx264's CRF closely at these levels
+            nvenc_preset = {'slower': 'p7', 'slow': 'p6', 'medium': 'p4', 'fast': 'p3', 'faster': 'p2',
+                            'veryfast': 'p1', 'superfast': 'p1', 'ultrafast': 'p1'}.get(preset, 'p4')
+            params = {'vcodec': self._venc, 'preset': nvenc_preset, 'rc': 'vbr', 'cq': crf,
+                      'profile:v': 'main', 'pix_fmt': 'yuv420p'}
+            if self._nvenc_quality:
+                params.update(_NVENC_QUALITY_PARAMS)
+        if self._threads:
+            # Batch jobs cap the filter graph too; ffmpeg otherwise gives every concurrent job
+            # a filter thread per core on top of its encoder threads
+            params.update({'threads': self._threads, 'filter_threads': self._threads,
+                           'filter_complex_threads': self._threads})
+        return params
+    
+    def _cuda_scale(self, video, params):
+        """Upload the filtered frames and do the output resize on the GPU when NVENC encodes them"""
+        if self._venc != 'h264_nvenc':
+            return video, params
+        # The CPU-only layers run at source size; the frames cross to VRAM once, before the
+        # upscale, and NVENC reads the scaled CUDA frames without another copy
+        params = dict(params)
+        size = params.pop('s', None)
+        params.pop('pix_fmt', None)  # scale_cuda sets the 4:2:0 format; a host pix_fmt would force a download
+        width, height = size.split('x') if size else ('iw', 'ih')
+        return video.filter('hwupload_cuda').filter('scale_cuda', width, height, format='yuv420p'), params
+    
+    def _input_options(self, path, hwaccel=True):
+        """Return ffmpeg input options for path: its demuxer, and the hardware decoder when the GPU encoder is in use"""
+        options = {}
+        # Naming the demuxer skips ffmpeg's format detection; the probe is cached and the presets make it anyway
+        try:
+            format_name = self._probe(path)['format'].get('format_name')
+        except Exception:
+            format_name = None  # ffmpeg detects the format itself
+        if format_name:
+            options['f'] = format_name.split(',')[0]
+        if hwaccel and self._hwaccel:
+            options['hwaccel'] = self._hwaccel
+        return options
+    
+    def _input(self, path, hwaccel=True):
+        """Open an ffmpeg input, hardware-decoded when the GPU encoder is in use"""
+        return ffmpeg.input(path, **self._input_options(path, hwaccel))
+    
+    def _filter_script(self, cmd):
+        """Move a compiled command's -filter_complex graph into a script file, returning the argv and file path"""
+        if '-filter_complex' not in cmd:
+            return cmd, None
+        # Long preset graphs stay out of argv (and its size limit); ffmpeg parses the file the same way
+        index = cmd.index('-filter_complex')
+        fd, script_path = tempfile.mkstemp(suffix='.txt', dir=self._scratch_dir)
+        with os.fdopen(fd, 'w') as script:
+            script.write(cmd[index + 1])
+        return cmd[:index] + ['-filter_complex_script', script_path] + cmd[index + 2:], script_path
+    
+    def _probe(self, path):
+        """Return ffmpeg.probe(path), reusing the result while the file is unchanged"""
+        # A preset probes the same input several times; each ffprobe run is a separate process,
+        # so PyAV reads the header in-process when it is installed
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        probe = self._probe_cache.get(key)
+        if probe is None:
+            try:
+                probe = _av_probe(path) if av is not None else None
+            except Exception:
+                probe = None  # Anything PyAV cannot open still gets ffprobe's verdict
+            if probe is None:
+                probe = ffmpeg.probe(path)
+            self._probe_cache[key] = probe
+            while len(self._probe_cache) > self.max_cached_probes:
+                self._probe_cache.popitem(last=False)
+        else:
+            self._probe_cache.move_to_end(key)
+        return probe
+    
+    def apply_presets_batch(self, input_paths, platform, preset=None):
+        """Apply one platform preset to several videos concurrently, preserving input order"""
+        input_paths = list(input_paths)
+        if not input_paths:
+            return []
+        pool = self._get_process_pool()
+        futures = []
+        for input_path in input_paths:
+            # A file of its own per job: concurrent encodes of inputs that share a stem would
+            # otherwise all write processed_{platform}_{stem}.mp4
+            fd, output_path = tempfile.mkstemp(suffix='.mp4', dir=self.temp_dir,
+                                               prefix=f"processed_{platform}_{_stem(input_path)}_")
+            os.close(fd)
+            # Blocks while every batch slot is busy, so queued jobs wait here rather than in the pool
+            _batch_slots.acquire()
+            try:
+                future = pool.submit(_apply_video_preset_in_worker, input_path, platform,
+                                     preset or self.encoder_preset, _BATCH_JOB_THREADS, output_path)
+            except Exception:
+                _batch_slots.release()
+                os.remove(output_path)
+                raise
+            future.add_done_callback(lambda _: _batch_slots.release())
+            futures.append(future)
+        return [future.result() for future in futures]
+    
+    def _get_process_pool(self):
+        """Return the shared video worker pool, starting it on first use"""
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                # One worker per batch slot: fewer, capped-thread ffmpeg jobs beat one wide encode,
+                # and the pool size also caps how many intermediate files sit in temp at once
+                workers = max(1, (os.cpu_count() or _BATCH_JOB_THREADS) // _BATCH_JOB_THREADS)
+                self._process_pool = ProcessPoolExecutor(max_workers=workers,
+                                                         mp_context=multiprocessing.get_context('spawn'))
+            return self._process_pool
+    
+    def _eq(self, stream, **params):
+        """Apply an eq filter, folding it into an eq upstream (past timing and hue filters) when the two compose exactly"""
+        node = stream.node
+        # setpts only rewrites timestamps and hue (without b) only rotates and scales chroma, which
+        # eq's luma curve and chroma gain commute with, so an eq behind them can absorb this one and
+        # they are replayed after the merged pass (fps is excluded: it changes the frame count)
+        timing = []
+        while len(node.incoming_edges) == 1 and (node.name in self._EQ_TRANSPARENT or (
+                node.name == 'hue' and not node.args and 'b' not in node.kwargs)):
+            timing.append(node)
+            node = node.incoming_edges[0].upstream_node
+        previous = node.kwargs if node.name == 'eq' and not node.args else None
+        if (previous is not None and set(previous) | set(params) <= self._EQ_FOLDABLE
+                and all(isinstance(value, (int, float)) for value in list(previous.values()) + list(params.values()))):
+            # eq is gamma(contrast * (x - 0.5) + 0.5 + brightness): a second stage folds in
+            # unless the first one's gamma sits between the two linear steps
+            gamma = previous.get('gamma', 1.0)
+            contrast = params.get('contrast', 1.0)
+            brightness = params.get('brightness', 0.0)
+            if gamma == 1.0 or (contrast == 1.0 and brightness == 0.0):
+                merged = {
+                    'brightness': previous.get('brightness', 0.0) * contrast + brightness,
+                    'contrast': previous.get('contrast', 1.0) * contrast,
+                    'gamma': gamma * params.get('gamma', 1.0),
+                    'saturation': previous.get('saturation', 1.0) * params.get('saturation', 1.0),
+                }
+                edge = node.incoming_edges[0]
+                upstream = edge.upstream_node.stream(label=edge.upstream_label, selector=edge.upstream_selector)
+                stream = upstream.filter('eq', **merged)
+                for timing_node in reversed(timing):
+                    stream = stream.filter(timing_node.name, *timing_node.args, **timing_node.kwargs)
+                return stream
+        return stream.filter('eq', **params)
+    
     def set_audio_quality(self, quality):
         """Set the audio quality for video processing"""
         self.audio_quality = quality
     
+    def set_encoder_preset(self, preset):
+        """Set the default libx264 preset (e.g. 'veryfast', 'faster', 'medium') for video encodes"""
+        self.encoder_preset = preset
+    
     def set_progress_callback(self, callback):
         """Set callback function for progress updates"""
         self.progress_callback = callback
@@ -275,9 +539,11 @@ class VideoProcessor:
             }
         }
     
-    def apply_preset(self, input_path, platform):
+    def apply_preset(self, input_path, platform, preset=None, output_path=None):
         """Apply platform-specific preset to video with advanced ML-mimicking protection"""
-        output_path = os.path.join(self.temp_dir, f"processed_{platform}_{Path(input_path).stem}.mp4")
+        preset = preset or self.encoder_preset  # libx264 speed preset for every encode in this run
+        # Callers with a final destination get the encode written there rather than staged in temp
+        output_path = output_path or os.path.join(self.temp_dir, f"processed_{platform}_{_stem(input_path)}.mp4")
         
         self.update_progress(50, f"Initializing 2025 ML-Mimicking System for {platform.upper()}...")
         
@@ -286,16 +552,7 @@ class VideoProcessor:
         
         self.update_progress(65, f"Starting {platform.upper()} ML-mimicking layers...")
         
-        if platform == 'tiktok':
-            result = self._apply_tiktok_2025_system(audio_protected_path, output_path)
-        elif platform == 'instagram':
-            result = self._apply_instagram_2025_system(audio_protected_path, output_path)
-        elif platform == 'youtube':
-            result = self._apply_youtube_2025_system(audio_protected_path, output_path)
-        elif platform == 'youtube_shorts':
-            result = self._apply_youtube_shorts_2025_system(audio_protected_path, output_path)
-        else:
-            raise ValueError(f"Unknown platform: {platform}")
+        result = self._platform_system(platform)(audio_protected_path, output_path, preset)
         
         # Clean up temporary audio file
         if audio_protected_path != input_path and os.path.exists(audio_protected_path):
@@ -304,20 +561,88 @@ class VideoProcessor:
         self.update_progress(98, f"{platform.upper()} ML-Mimicking Protection Complete!")
         return result
     
+    def apply_presets_multi(self, input_path, platforms, preset=None):
+        """Apply several platform presets to one video in a single ffmpeg run, decoding the input once"""
+        preset = preset or self.encoder_preset
+        platforms = list(platforms)
+        # Outputs are named by platform and stem, so a repeated platform would overwrite itself
+        duplicates = sorted({platform for platform in platforms if platforms.count(platform) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate platforms: {', '.join(duplicates)}")
+        systems = [self._platform_system(platform) for platform in platforms]
+        outputs = []  # (streams, output_path, params) per platform, filled in by each system
+        scratch_paths = []
+        # ffmpeg decodes the original video once and splits the frames between the platform
+        # chains; each protected intermediate only contributes its audio stream
+        branches = self._input(input_path).video.filter_multi_output('split', len(systems))
+        
+        try:
+            # Every platform's audio encode runs at once; the chains need the finished files
+            jobs = [self._start_audio_protection(input_path, platform) for platform in platforms]
+            for job in jobs:
+                if job is not None:
+                    scratch_paths.append(job[0])
+            audio_protected_paths = [self._finish_audio_protection(input_path, job) for job in jobs]
+            
+            for index, (platform, system) in enumerate(zip(platforms, systems)):
+                self.update_progress(50, f"Building {platform.upper()} ML-mimicking layers...")
+                audio_protected_path = audio_protected_paths[index]
+                output_path = os.path.join(self.temp_dir, f"processed_{platform}_{_stem(input_path)}.mp4")
+                system(audio_protected_path, output_path, preset, video=branches.stream(index), collect=outputs)
+            
+            self.update_progress(85, f"Encoding {len(outputs)} renditions in one pass...")
+            cmd = (
+                ffmpeg
+                .merge_outputs(*[ffmpeg.output(*streams, output_path, **params)
+                                 for streams, output_path, params in outputs])
+                .global_args('-progress', 'pipe:2')
+                .overwrite_output()
+                .compile()
+            )
+            duration = float(self._probe(input_path)['format']['duration'])
+            cmd, script_path = self._filter_script(cmd)
+            if script_path:
+                scratch_paths.append(script_path)
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1, universal_newlines=True)
+            self._monitor_subprocess_progress(process, duration, 85, 98)
+        finally:
+            for scratch_path in scratch_paths:
+                if os.path.exists(scratch_path):
+                    os.remove(scratch_path)
+        
+        self.update_progress(100, f"{len(outputs)} renditions complete!")
+        return [output_path for _, output_path, _ in outputs]
+    
+    def _platform_system(self, platform):
+        """Return the ML-mimicking system method for a platform"""
+        system = self._platform_systems.get(platform)
+        if system is None:
+            raise ValueError(f"Unknown platform: {platform}")
+        return system
+    
     def _apply_advanced_audio_protection(self, input_path, platform):
         """Apply advanced audio protection with Hz manipulation and fingerprint evasion"""
+        return self._finish_audio_protection(input_path, self._start_audio_protection(input_path, platform))
+    
+    def _start_audio_protection(self, input_path, platform):
+        """Launch the audio protection encode without waiting; returns a job for _finish_audio_protection"""
+        audio_output = None
         try:
             self.update_progress(12, "Applying Advanced Audio Protection...")
             
             # Check if video has audio
-            probe = ffmpeg.probe(input_path)
+            probe = self._probe(input_path)
             has_audio = any(stream['codec_type'] == 'audio' for stream in probe['streams'])
             
             if not has_audio:
                 self.update_progress(22, "No audio detected, skipping audio protection")
-                return input_path
+                return None
             
-            audio_output = os.path.join(self.temp_dir, f"audio_protected_{Path(input_path).stem}.mp4")
+            # A file of its own per job: multi-platform runs encode these concurrently, and batch
+            # workers may be handed inputs that share a stem
+            fd, audio_output = tempfile.mkstemp(suffix='.mp4', dir=self.temp_dir,
+                                                prefix=f"audio_protected_{platform}_{_stem(input_path)}_")
+            os.close(fd)
             
             # Advanced audio fingerprint evasion parameters
             sample_rates = [44100, 48000, 47999, 44099]  # Hz manipulation
@@ -342,7 +667,7 @@ class VideoProcessor:
             self.update_progress(15, f"Manipulating audio Hz: {current_sr} → {target_sr}")
             
             # Apply advanced audio protection chain
-            input_stream = ffmpeg.input(input_path)
+            input_stream = self._input(input_path, hwaccel=False)  # Video is stream-copied
             
             # Audio processing chain with compression resistance
             audio_chain = (
@@ -356,23 +681,44 @@ class VideoProcessor:
                 .filter('aresample', 48000)                        # Final standardization
             )
             
-            # Apply to video with audio chain
-            (
+            # Apply to video with audio chain; errors only on stderr, so the pipe never fills
+            # while the caller is still busy and the process runs on unattended
+            process = (
                 ffmpeg
                 .output(input_stream.video, audio_chain, audio_output,
                        vcodec='copy',  # Keep video unchanged
                        acodec='aac', audio_bitrate=self.audio_quality)
+                .global_args('-nostats', '-loglevel', 'error')
                 .overwrite_output()
-                .run(quiet=True)
+                .run_async(pipe_stderr=True)
             )
+            return audio_output, process, f"Hz {current_sr}→{target_sr}"
+            
+        except Exception as e:
+            print(f"⚠ Audio protection failed, using original: {e}")
+            if audio_output is not None and os.path.exists(audio_output):
+                os.remove(audio_output)
+            return None
+    
+    def _finish_audio_protection(self, input_path, job):
+        """Wait for a started audio protection encode; returns its output, or input_path if there is none"""
+        if job is None:
+            return input_path
+        audio_output, process, summary = job
+        try:
+            _, stderr = process.communicate()
+            if process.returncode:
+                raise ffmpeg.Error('ffmpeg', None, stderr)
             
             self.update_progress(22, f"Audio protection applied: Hz manipulation + EQ + compression resistance")
-            print(f"✓ Advanced Audio Protection: Hz {current_sr}→{target_sr}, EQ manipulation, compression resistance")
+            print(f"✓ Advanced Audio Protection: {summary}, EQ manipulation, compression resistance")
             
             return audio_output
             
         except Exception as e:
             print(f"⚠ Audio protection failed, using original: {e}")
+            if os.path.exists(audio_output):
+                os.remove(audio_output)
             return input_path
     
     def apply_protection_layer(self, video, layer_name, filter_func, fallback_func=None):
@@ -393,14 +739,14 @@ class VideoProcessor:
             print(f"→ {layer_name}: Continuing without this layer")
             return video
 
-    def _apply_tiktok_2025_system(self, input_path, output_path):
+    def _apply_tiktok_2025_system(self, input_path, output_path, preset, video=None, collect=None):
         """TikTok: Advanced 2025 ML-Mimicking Protection System with 6 Sophisticated Layers"""
         try:
             self.update_progress(30, "Initializing TikTok 2025 ML-Mimicking Protection...")
             
             # Initialize advanced system
-            input_stream = ffmpeg.input(input_path)
-            video = input_stream.video
+            input_stream = self._input(input_path)
+            video = input_stream.video if video is None else video
             protection_layers_applied = []
             
             # Get platform-specific targeting parameters
@@ -408,7 +754,7 @@ class VideoProcessor:
             
             # Check for audio
             try:
-                probe = ffmpeg.probe(input_path)
+                probe = self._probe(input_path)
                 has_audio = any(stream['codec_type'] == 'audio' for stream in probe['streams'])
                 print(f"Audio detection: {has_audio} streams found")
             except Exception as e:
@@ -429,8 +775,7 @@ class VideoProcessor:
                 gamma_perturbation = 1.0 + (epsilon * random.choice(gradient_signs) * 0.15)
                 saturation_perturbation = 1.0 + (epsilon * random.choice(gradient_signs) * 0.2)
                 
-                return v.filter('eq', 
-                               brightness=brightness_perturbation, 
+                return self._eq(v, brightness=brightness_perturbation, 
                                contrast=contrast_perturbation,
                                gamma=gamma_perturbation,
                                saturation=saturation_perturbation)
@@ -438,7 +783,7 @@ class VideoProcessor:
             def fgsm_adversarial_fallback(v):
                 # Fallback FGSM simulation
                 epsilon = 0.02
-                return v.filter('eq', brightness=epsilon * 0.5, contrast=1.0 + epsilon * 0.3)
+                return self._eq(v, brightness=epsilon * 0.5, contrast=1.0 + epsilon * 0.3)
             
             video = self.apply_protection_layer(
                 video, "FGSM Adversarial Simulation", fgsm_adversarial_advanced, fgsm_adversarial_fallback
@@ -467,7 +812,7 @@ class VideoProcessor:
                 elif target_depth <= 18:  # Mid layers (feature detection)
                     return v.filter('scale', f'iw*{1 + sigmoid_shift * 0.01}', f'ih*{1 + sigmoid_shift * 0.01}')
                 else:  # Deep layers (semantic understanding)
-                    return v.filter('setpts', f'{temporal_stride}*PTS').filter('eq', gamma=1 + sigmoid_shift * 0.1)
+                    return self._eq(v.filter('setpts', f'{temporal_stride}*PTS'), gamma=1 + sigmoid_shift * 0.1)
             
             def neural_confusion_fallback(v):
                 # Simple neural confusion fallback
@@ -502,14 +847,14 @@ class VideoProcessor:
                 # Add temporal perturbations for video-specific transfer attacks
                 temporal_scaling = 1.0 + (random.uniform(-0.002, 0.002) * transferability_coeff)
                 
-                return (v.filter('eq', brightness=brightness_universal, 
+                return (self._eq(v, brightness=brightness_universal, 
                                 contrast=contrast_universal, 
                                 saturation=saturation_universal)
                          .filter('setpts', f'{temporal_scaling}*PTS'))
             
             def transfer_learning_fallback(v):
                 # Simplified transfer learning simulation
-                return v.filter('eq', brightness=0.01, contrast=1.02, saturation=1.01)
+                return self._eq(v, brightness=0.01, contrast=1.02, saturation=1.01)
             
             video = self.apply_protection_layer(
                 video, "Transfer Learning Exploitation", transfer_learning_advanced, transfer_learning_fallback
@@ -544,12 +889,12 @@ class VideoProcessor:
                 # Face detection evasion through subtle brightness changes
                 brightness_shift = random.uniform(-0.01, 0.01) * face_detection_bypass
                 
-                return (v.filter('eq', gamma=gamma_shift, brightness=brightness_shift)
+                return (self._eq(v, gamma=gamma_shift, brightness=brightness_shift)
                          .filter('setpts', f'{temporal_shift}*PTS'))
             
             def tiktok_targeting_fallback(v):
                 # Simple TikTok targeting fallback
-                return v.filter('eq', gamma=1.02, brightness=0.005)
+                return self._eq(v, gamma=1.02, brightness=0.005)
             
             video = self.apply_protection_layer(
                 video, "TikTok Platform Targeting", tiktok_targeting_advanced, tiktok_targeting_fallback
@@ -592,11 +937,11 @@ class VideoProcessor:
                 elif time_seed == 1:
                     return v.filter('scale', f'iw*{random.uniform(0.9995, 1.0005)}', f'ih*{random.uniform(0.9995, 1.0005)}')
                 elif time_seed == 2:
-                    return v.filter('eq', saturation=random.uniform(0.98, 1.03))
+                    return self._eq(v, saturation=random.uniform(0.98, 1.03))
                 else:
                     # Combine multiple subtle effects
                     brightness_poly = (session_hash / 50000)  # Normalize to small range
-                    return v.filter('eq', brightness=brightness_poly).filter('fps', fps=random.uniform(59.8, 60.2))
+                    return self._eq(v, brightness=brightness_poly).filter('fps', fps=random.uniform(59.8, 60.2))
             
             def polymorphic_fallback(v):
                 return v.filter('noise', alls=6, allf='t')
@@ -645,7 +990,8 @@ class VideoProcessor:
             # This happens during encoding to strip and randomize metadata
             metadata_randomization = {
                 'creation_time': f'2024-{random.randint(1,12):02d}-{random.randint(1,28):02d}T{random.randint(0,23):02d}:{random.randint(0,59):02d}:{random.randint(0,59):02d}Z',
-                'encoder': f'Lavf{random.randint(58,61)}.{random.randint(10,99)}.{random.randint(100,999)}'
+                'encoder': f'Lavf{random.randint(58,61)}.{random.randint(10,99)}.{random.randint(100,999)}',
+                'comment': metadata_randomization['comment']
             }
             
             self.update_progress(80, "Preparing 2025 Anti-Detection Encoding...")
@@ -659,18 +1005,24 @@ class VideoProcessor:
             
             # ULTRA-HIGH QUALITY ENCODING with 2025 ML-mimicking protection
             encoding_params = {
-                'vcodec': 'libx264',
-                'crf': 16,
-                'preset': 'slow',
+                **self._encoder_params(16, preset),
                 'b:v': '12M',
                 'r': 60,
                 's': '1920x1080',
                 'pix_fmt': 'yuv420p',
-                'metadata:g:0': metadata_randomization['creation_time'],
-                'metadata:s:v:0': f'encoder={metadata_randomization["encoder"]}',
-                'metadata:s:v:1': f'comment={metadata_randomization["comment"]}'
+                # Global tags, one key=value pair per -metadata:g option
+                'metadata:g:0': f'creation_time={metadata_randomization["creation_time"]}',
+                'metadata:g:1': f'encoder={metadata_randomization["encoder"]}',
+                'metadata:g:2': f'comment={metadata_randomization["comment"]}'
             }
             
+            if collect is not None:
+                # Same options as the command line below
+                video, params = self._cuda_scale(video, encoding_params)
+                collect.append(((video, input_stream.audio) if has_audio else (video,), output_path,
+                                {'acodec': 'copy', **params} if has_audio else params))
+                return output_path
+            
             self.update_progress(85, "Starting TikTok 1080p60 encoding...")
             
             # ENCODING WITH REAL-TIME PROGRESS TRACKING
@@ -678,7 +1030,7 @@ class VideoProcessor:
                 print(f"Final encoding with parameters: {encoding_params}")
                 
                 # Get video duration for accurate progress tracking
-                probe = ffmpeg.probe(input_path)
+                probe = self._probe(input_path)
                 duration = float(probe['format']['duration'])
                 print(f"Video duration: {duration:.2f} seconds")
                 
@@ -688,17 +1040,18 @@ class VideoProcessor:
                 # Convert encoding params to command line arguments
                 cmd_args = []
                 for key, value in encoding_params.items():
-                    if key.startswith('metadata'):
-                        cmd_args.extend(['-metadata', f'{key.split(":")[-1]}={value}'])
-                    else:
-                        cmd_args.extend([f'-{key}', str(value)])
+                    cmd_args.extend([f'-{key}', str(value)])
                 
+                input_args = []
+                for key, value in self._input_options(input_path).items():
+                    input_args.extend([f'-{key}', value])
+                input_args.extend(['-i', input_path])
                 if has_audio:
                     print("Encoding with audio preservation...")
-                    cmd = ['ffmpeg', '-i', input_path, '-c:a', 'copy'] + cmd_args + ['-progress', 'pipe:2', '-y', output_path]
+                    cmd = ['ffmpeg'] + input_args + ['-c:a', 'copy'] + cmd_args + ['-progress', 'pipe:2', '-y', output_path]
                 else:
                     print("Encoding video only...")
-                    cmd = ['ffmpeg', '-i', input_path] + cmd_args + ['-progress', 'pipe:2', '-y', output_path]
+                    cmd = ['ffmpeg'] + input_args + cmd_args + ['-progress', 'pipe:2', '-y', output_path]
                 
                 # Start subprocess with progress monitoring
                 process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1, universal_newlines=True)
@@ -709,7 +1062,7 @@ class VideoProcessor:
                 # VALIDATE OUTPUT QUALITY
                 self.update_progress(99, "Validating TikTok output quality...")
                 
-                probe = ffmpeg.probe(output_path)
+                probe = self._probe(output_path)
                 video_stream = next(s for s in probe['streams'] if s['codec_type'] == 'video')
                 width = int(video_stream['width'])
                 height = int(video_stream['height'])
@@ -741,7 +1094,7 @@ class VideoProcessor:
                     ffmpeg
                     .input(input_path)
                     .output(output_path, 
-                           vcodec='libx264', crf=18, preset='medium',
+                           vcodec='libx264', crf=18, preset=preset,
                            **{'b:v': '8M', 'r': 60, 's': '1920x1080'})
                     .overwrite_output()
                     .run(quiet=False)
@@ -753,13 +1106,13 @@ class VideoProcessor:
         except Exception as e:
             raise Exception(f"TikTok processing failed: {e}")
     
-    def _apply_instagram_2025_system(self, input_path, output_path):
+    def _apply_instagram_2025_system(self, input_path, output_path, preset, video=None, collect=None):
         """Instagram: Advanced 2025 ML-Mimicking Protection System with 4 Sophisticated Layers"""
         try:
             self.update_progress(30, "Initializing Instagram 2025 ML-Mimicking Protection...")
             
-            input_stream = ffmpeg.input(input_path)
-            video = input_stream.video
+            input_stream = self._input(input_path)
+            video = input_stream.video if video is None else video
             protection_layers_applied = []
             
             # Get platform-specific targeting parameters
@@ -767,7 +1120,7 @@ class VideoProcessor:
             
             # Check for audio
             try:
-                probe = ffmpeg.probe(input_path)
+                probe = self._probe(input_path)
                 has_audio = any(stream['codec_type'] == 'audio' for stream in probe['streams'])
                 print(f"Audio detection: {has_audio} streams found")
             except Exception as e:
@@ -806,14 +1159,13 @@ class VideoProcessor:
                 contrast_perturbation = 1.0 + (epsilon * random.choice(gradient_signs) * ai_watermark_bypass * 0.15)
                 gamma_perturbation = 1.0 + (epsilon * random.choice(gradient_signs) * 0.1)
                 
-                return v.filter('eq', 
-                               saturation=saturation_perturbation,
+                return self._eq(v, saturation=saturation_perturbation,
                                brightness=brightness_perturbation, 
                                contrast=contrast_perturbation,
                                gamma=gamma_perturbation)
             
             def instagram_fgsm_fallback(v):
-                return v.filter('eq', saturation=1.2, brightness=0.02, contrast=1.08)
+                return self._eq(v, saturation=1.2, brightness=0.02, contrast=1.08)
             
             video = self.apply_protection_layer(
                 video, "Instagram FGSM Adversarial", instagram_fgsm_advanced, instagram_fgsm_fallback
@@ -872,11 +1224,11 @@ class VideoProcessor:
                 # Temporal perturbations for video hash evasion
                 temporal_scaling = 1.0 + (random.uniform(-0.0015, 0.0015) * transferability_coeff)
                 
-                return (v.filter('eq', brightness=brightness_universal, gamma=gamma_universal)
+                return (self._eq(v, brightness=brightness_universal, gamma=gamma_universal)
                          .filter('setpts', f'{temporal_scaling}*PTS'))
             
             def instagram_transfer_learning_fallback(v):
-                return v.filter('eq', brightness=0.008, gamma=1.03)
+                return self._eq(v, brightness=0.008, gamma=1.03)
             
             video = self.apply_protection_layer(
                 video, "Instagram Transfer Learning", instagram_transfer_learning_advanced, instagram_transfer_learning_fallback
@@ -931,15 +1283,19 @@ class VideoProcessor:
             
             # HIGH-QUALITY ENCODING with 2025 ML-mimicking protection
             encoding_params = {
-                'vcodec': 'libx264',
-                'crf': 16,
-                'preset': 'slow',
+                **self._encoder_params(16, preset),
                 'b:v': '10M',
                 'r': 60,
                 's': '1080x1920',  # Instagram Reels 9:16
                 'pix_fmt': 'yuv420p'
                 # Note: Metadata injection sometimes causes FFmpeg errors, applied separately if needed
             }
+            video, encoding_params = self._cuda_scale(video, encoding_params)
+            
+            if collect is not None:
+                collect.append(((video, input_stream.audio) if has_audio else (video,), output_path,
+                                {'acodec': 'copy', **encoding_params} if has_audio else encoding_params))
+                return output_path
             
             self.update_progress(85, "Starting Instagram 1080x1920 encoding...")
             
@@ -947,7 +1303,7 @@ class VideoProcessor:
                 print(f"Instagram encoding with parameters: {encoding_params}")
                 
                 # Get video duration for accurate progress tracking
-                probe = ffmpeg.probe(input_path)
+                probe = self._probe(input_path)
                 duration = float(probe['format']['duration'])
                 print(f"Video duration: {duration:.2f} seconds")
                 
@@ -1014,7 +1370,7 @@ class VideoProcessor:
                 
                 # Validate output
                 self.update_progress(99, "Validating Instagram output...")
-                probe = ffmpeg.probe(output_path)
+                probe = self._probe(output_path)
                 video_stream = next(s for s in probe['streams'] if s['codec_type'] == 'video')
                 width = int(video_stream['width'])
                 height = int(video_stream['height'])
@@ -1036,7 +1392,7 @@ class VideoProcessor:
                     (
                         ffmpeg
                         .input(input_path)
-                        .output(output_path, vcodec='libx264', crf=16, preset='slow', 
+                        .output(output_path, vcodec='libx264', crf=16, preset=preset, 
                                **{'b:v': '10M', 's': '1080x1920', 'r': 60, 'pix_fmt': 'yuv420p'})
                         .overwrite_output()
                         .run(quiet=False)
@@ -1048,7 +1404,7 @@ class VideoProcessor:
                     (
                         ffmpeg
                         .input(input_path)
-                        .output(output_path, vcodec='libx264', crf=18, **{'s': '1080x1920'})
+                        .output(output_path, vcodec='libx264', crf=18, preset=preset, **{'s': '1080x1920'})
                         .overwrite_output()
                         .run(quiet=False)
                     )
@@ -1057,13 +1413,13 @@ class VideoProcessor:
         except Exception as e:
             raise Exception(f"Instagram processing failed: {e}")
     
-    def _apply_youtube_2025_system(self, input_path, output_path):
+    def _apply_youtube_2025_system(self, input_path, output_path, preset, video=None, collect=None):
         """YouTube: Advanced 2025 ML-Mimicking Protection System with 4 Sophisticated Layers"""
         try:
             self.update_progress(30, "Initializing YouTube 2025 ML-Mimicking Protection...")
             
-            input_stream = ffmpeg.input(input_path)
-            video = input_stream.video
+            input_stream = self._input(input_path)
+            video = input_stream.video if video is None else video
             protection_layers_applied = []
             
             # Get platform-specific targeting parameters
@@ -1071,7 +1427,7 @@ class VideoProcessor:
             
             # Check for audio
             try:
-                probe = ffmpeg.probe(input_path)
+                probe = self._probe(input_path)
                 has_audio = any(stream['codec_type'] == 'audio' for stream in probe['streams'])
                 print(f"Audio detection: {has_audio} streams found")
             except Exception as e:
@@ -1108,14 +1464,13 @@ class VideoProcessor:
                 contrast_perturbation = 1.0 + (epsilon * random.choice(gradient_signs) * content_id_bypass * 0.18)
                 gamma_perturbation = 1.0 + (epsilon * random.choice(gradient_signs) * 0.12)
                 
-                return v.filter('eq', 
-                               saturation=saturation_perturbation,
+                return self._eq(v, saturation=saturation_perturbation,
                                brightness=brightness_perturbation, 
                                contrast=contrast_perturbation,
                                gamma=gamma_perturbation)
             
             def youtube_contentid_fgsm_fallback(v):
-                return v.filter('eq', saturation=1.15, brightness=0.015, contrast=1.08)
+                return self._eq(v, saturation=1.15, brightness=0.015, contrast=1.08)
             
             video = self.apply_protection_layer(
                 video, "YouTube Content-ID FGSM", youtube_contentid_fgsm_advanced, youtube_contentid_fgsm_fallback
@@ -1236,9 +1591,7 @@ class VideoProcessor:
             
             # ULTRA-HIGH QUALITY ENCODING with 2025 ML-mimicking protection
             encoding_params = {
-                'vcodec': 'libx264',
-                'crf': 15,  # Highest quality
-                'preset': 'slow',
+                **self._encoder_params(15, preset, tune='film,fastdecode'),  # Highest quality
                 'b:v': '15M',  # Highest bitrate
                 'r': 60,
                 's': '1920x1080',
@@ -1247,6 +1600,12 @@ class VideoProcessor:
                 'metadata:s:v:0': f'encoder={metadata_randomization["encoder"]}',
                 'metadata:s:v:1': f'comment={metadata_randomization["comment"]}'
             }
+            video, encoding_params = self._cuda_scale(video, encoding_params)
+            
+            if collect is not None:
+                collect.append(((video, input_stream.audio) if has_audio else (video,), output_path,
+                                {'acodec': 'copy', **encoding_params} if has_audio else encoding_params))
+                return output_path
             
             self.update_progress(85, "Starting YouTube 1080p60 CRF 15 encoding...")
             
@@ -1254,7 +1613,7 @@ class VideoProcessor:
                 print(f"YouTube encoding with parameters: {encoding_params}")
                 
                 # Get video duration for accurate progress tracking
-                probe = ffmpeg.probe(input_path)
+                probe = self._probe(input_path)
                 duration = float(probe['format']['duration'])
                 print(f"Video duration: {duration:.2f} seconds")
                 
@@ -1280,7 +1639,7 @@ class VideoProcessor:
                 
                 # Validate output
                 self.update_progress(99, "Validating YouTube output...")
-                probe = ffmpeg.probe(output_path)
+                probe = self._probe(output_path)
                 video_stream = next(s for s in probe['streams'] if s['codec_type'] == 'video')
                 width = int(video_stream['width'])
                 height = int(video_stream['height'])
@@ -1303,7 +1662,7 @@ class VideoProcessor:
                 (
                     ffmpeg
                     .input(input_path)
-                    .output(output_path, vcodec='libx264', crf=17, **{'b:v': '12M', 's': '1920x1080'})
+                    .output(output_path, vcodec='libx264', crf=17, preset=preset, **{'b:v': '12M', 's': '1920x1080'})
                     .overwrite_output()
                     .run(quiet=False)
                 )
@@ -1312,13 +1671,13 @@ class VideoProcessor:
         except Exception as e:
             raise Exception(f"YouTube processing failed: {e}")
     
-    def _apply_youtube_shorts_2025_system(self, input_path, output_path):
+    def _apply_youtube_shorts_2025_system(self, input_path, output_path, preset, video=None, collect=None):
         """YouTube Shorts: Advanced 2025 ML-Mimicking Protection System with 4 Sophisticated Layers (9:16 Format)"""
         try:
             self.update_progress(30, "Initializing YouTube Shorts 2025 ML-Mimicking Protection...")
             
-            input_stream = ffmpeg.input(input_path)
-            video = input_stream.video
+            input_stream = self._input(input_path)
+            video = input_stream.video if video is None else video
             protection_layers_applied = []
             
             # Get platform-specific targeting parameters (use YouTube params)
@@ -1326,7 +1685,7 @@ class VideoProcessor:
             
             # Check for audio
             try:
-                probe = ffmpeg.probe(input_path)
+                probe = self._probe(input_path)
                 has_audio = any(stream['codec_type'] == 'audio' for stream in probe['streams'])
                 print(f"Audio detection: {has_audio} streams found")
             except Exception as e:
@@ -1363,14 +1722,13 @@ class VideoProcessor:
                 contrast_perturbation = 1.0 + (epsilon * random.choice(gradient_signs) * content_id_bypass * 0.18)
                 gamma_perturbation = 1.0 + (epsilon * random.choice(gradient_signs) * 0.12)
                 
-                return v.filter('eq', 
-                               saturation=saturation_perturbation,
+                return self._eq(v, saturation=saturation_perturbation,
                                brightness=brightness_perturbation, 
                                contrast=contrast_perturbation,
                                gamma=gamma_perturbation)
             
             def youtube_shorts_contentid_fgsm_fallback(v):
-                return v.filter('eq', saturation=1.15, brightness=0.015, contrast=1.08)
+                return self._eq(v, saturation=1.15, brightness=0.015, contrast=1.08)
             
             video = self.apply_protection_layer(
                 video, "YouTube Shorts Content-ID FGSM", youtube_shorts_contentid_fgsm_advanced, youtube_shorts_contentid_fgsm_fallback
@@ -1422,11 +1780,11 @@ class VideoProcessor:
                 
                 temporal_scaling = 1.0 + (random.uniform(-0.001, 0.001) * transferability_coeff)
                 
-                return (v.filter('eq', brightness=brightness_universal, contrast=contrast_universal)
+                return (self._eq(v, brightness=brightness_universal, contrast=contrast_universal)
                          .filter('setpts', f'{temporal_scaling}*PTS'))
             
             def youtube_shorts_transfer_learning_fallback(v):
-                return v.filter('eq', brightness=0.005, contrast=1.03)
+                return self._eq(v, brightness=0.005, contrast=1.03)
             
             video = self.apply_protection_layer(
                 video, "YouTube Shorts Transfer Learning", youtube_shorts_transfer_learning_advanced, youtube_shorts_transfer_learning_fallback
@@ -1455,60 +1813,52 @@ class VideoProcessor:
             )
             protection_layers_applied.append("YTS-Targeting")
 
+            encoding_params = {
+                **self._encoder_params(15, preset),
+                'b:v': '15M', 'maxrate': '18M', 'bufsize': '30M',
+                'r': 60, 's': '1080x1920',
+                'pix_fmt': 'yuv420p',
+                'movflags': '+faststart',
+                'metadata': f'creation_time={self._get_random_timestamp()}'
+            }
+            if has_audio and any(stream['codec_type'] == 'audio' and stream.get('codec_name') == 'aac'
+                                 and str(stream.get('sample_rate')) == '48000' for stream in probe['streams']):
+                # The audio-protected intermediate is already 48 kHz AAC at the session bitrate
+                encoding_params['acodec'] = 'copy'
+            elif has_audio:
+                encoding_params.update({'acodec': 'aac', 'b:a': f'{self.audio_quality}', 'ar': 48000})
+            video, encoding_params = self._cuda_scale(video, encoding_params)
+            streams = (video, input_stream.audio) if has_audio else (video,)
+            
+            if collect is not None:
+                collect.append((streams, output_path, encoding_params))
+                return output_path
+            
             self.update_progress(85, "Finalizing YouTube Shorts encoding...")
             
             # FINAL ENCODING with YouTube Shorts optimization (9:16 format)
             try:
-                if has_audio:
-                    audio = input_stream.audio
-                    
-                    cmd = (
-                        ffmpeg
-                        .output(video, audio, output_path,
-                               vcodec='libx264', acodec='aac',
-                               **{
-                                   'crf': 15, 'preset': 'slow',
-                                   'b:v': '15M', 'maxrate': '18M', 'bufsize': '30M',
-                                   'b:a': f'{self.audio_quality}', 'ar': 48000,
-                                   'r': 60, 's': '1080x1920',
-                                   'pix_fmt': 'yuv420p',
-                                   'movflags': '+faststart',
-                                   'metadata': f'creation_time={self._get_random_timestamp()}'
-                               })
-                        .overwrite_output()
-                        .compile()
-                    )
-                else:
-                    cmd = (
-                        ffmpeg
-                        .output(video, output_path,
-                               vcodec='libx264',
-                               **{
-                                   'crf': 15, 'preset': 'slow',
-                                   'b:v': '15M', 'maxrate': '18M', 'bufsize': '30M',
-                                   'r': 60, 's': '1080x1920',
-                                   'pix_fmt': 'yuv420p',
-                                   'movflags': '+faststart',
-                                   'metadata': f'creation_time={self._get_random_timestamp()}'
-                               })
-                        .overwrite_output()
-                        .compile()
-                    )
+                cmd = ffmpeg.output(*streams, output_path, **encoding_params).overwrite_output().compile()
                 
                 # Get video duration for progress monitoring
-                probe = ffmpeg.probe(input_path)
+                probe = self._probe(input_path)
                 duration = float(probe['format']['duration'])
                 
                 # Start subprocess with progress monitoring
-                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1, universal_newlines=True)
-                
-                # Track real-time encoding progress
-                self._monitor_subprocess_progress(process, duration, 85, 98)
+                cmd, script_path = self._filter_script(cmd)
+                try:
+                    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1, universal_newlines=True)
+                    
+                    # Track real-time encoding progress
+                    self._monitor_subprocess_progress(process, duration, 85, 98)
+                finally:
+                    if script_path:
+                        os.remove(script_path)
                 
                 # VALIDATE OUTPUT QUALITY
                 self.update_progress(99, "Validating YouTube Shorts output quality...")
                 
-                probe = ffmpeg.probe(output_path)
+                probe = self._probe(output_path)
                 video_stream = next(s for s in probe['streams'] if s['codec_type'] == 'video')
                 width = int(video_stream['width'])
                 height = int(video_stream['height'])
@@ -1531,7 +1881,7 @@ class VideoProcessor:
                 (
                     ffmpeg
                     .input(input_path)
-                    .output(output_path, vcodec='libx264', crf=17, **{'b:v': '12M', 's': '1080x1920'})
+                    .output(output_path, vcodec='libx264', crf=17, preset=preset, **{'b:v': '12M', 's': '1080x1920'})
                     .overwrite_output()
                     .run(quiet=False)
                 )
@@ -1549,109 +1899,124 @@ class VideoProcessor:
         variation_seed = self._apply_batch_protection(variation_seed, platform)
         
         if platform == 'tiktok':
-            return {
+            # Bound once: each draw below is a local lookup, and the tables use one random() call per value
+            uniform, choice, randint, rand = random.uniform, random.choice, random.randint, random.random
+            variation = {
                 # === TEMPORAL DOMAIN ===
-                'speed_factor': random.uniform(0.998, 1.002),    # Micro speed variations (imperceptible)
-                'frame_manipulation': random.choice([True, False]),
-                'frame_step': random.choice([1, 2, 3]),          # Frame step for duplication/deletion
-                'use_frame_interpolation': random.choice([True, False]),
-                'target_fps': random.choice([29.97, 30, 30.03]), # Slight FPS variations
+                'speed_factor': uniform(0.998, 1.002),    # Micro speed variations (imperceptible)
+                'frame_manipulation': choice([True, False]),
+                'frame_step': choice([1, 2, 3]),          # Frame step for duplication/deletion
+                'use_frame_interpolation': choice([True, False]),
+                'target_fps': choice([29.97, 30, 30.03]), # Slight FPS variations
                 
                 # === SPATIAL DOMAIN ===
-                'zoom_factor': random.uniform(1.01, 1.05),       # Subtle zoom
-                'zoom_period': random.uniform(60, 120),          # Zoom oscillation period
-                'optical_flow_disruption': random.choice([True, False]),
-                'flow_stepsize': random.choice([6, 8, 12]),      # Motion detection step size
-                'flow_smoothing': random.randint(10, 30),        # Flow smoothing
-                'flow_maxshift': random.randint(5, 15),          # Max motion shift
-                'flow_maxangle': random.uniform(0.1, 0.3),       # Max rotation angle
-                'apply_perspective': random.choice([True, False]),
-                'perspective': {
-                    'x0': random.uniform(0, 5), 'y0': random.uniform(0, 5),
-                    'x1': random.uniform(95, 100), 'y1': random.uniform(0, 5),
-                    'x2': random.uniform(0, 5), 'y2': random.uniform(95, 100),
-                    'x3': random.uniform(95, 100), 'y3': random.uniform(95, 100)
-                },
-                'lens_distortion': random.choice([True, False]),
-                'lens_cx': random.uniform(0.45, 0.55),           # Lens center X
-                'lens_cy': random.uniform(0.45, 0.55),           # Lens center Y
-                'lens_k1': random.uniform(-0.05, 0.05),          # Lens distortion k1
-                'lens_k2': random.uniform(-0.02, 0.02),          # Lens distortion k2
+                'zoom_factor': uniform(1.01, 1.05),       # Subtle zoom
+                'zoom_period': uniform(60, 120),          # Zoom oscillation period
+                'optical_flow_disruption': choice([True, False]),
+                'apply_perspective': choice([True, False]),
+                'lens_distortion': choice([True, False]),
                 
                 # === FREQUENCY DOMAIN ===
-                'brightness': random.uniform(0.005, 0.02),       # Very subtle brightness
-                'contrast': random.uniform(1.01, 1.05),          # Minimal contrast changes
-                'saturation': random.uniform(1.02, 1.08),        # Subtle saturation
-                'gamma': random.uniform(0.98, 1.02),             # Gamma correction
-                'unsharp_size': random.choice([3, 5]),           # Sharpening variations
-                'unsharp_amount': random.uniform(0.1, 0.3),      # Minimal sharpening
+                'brightness': uniform(0.005, 0.02),       # Very subtle brightness
+                'contrast': uniform(1.01, 1.05),          # Minimal contrast changes
+                'saturation': uniform(1.02, 1.08),        # Subtle saturation
+                'gamma': uniform(0.98, 1.02),             # Gamma correction
+                'unsharp_size': choice([3, 5]),           # Sharpening variations
+                'unsharp_amount': uniform(0.1, 0.3),      # Minimal sharpening
                 
                 # === NOISE SYSTEM ===
-                'noise_level': random.randint(3, 8),             # Very low noise
-                'adaptive_noise': random.choice([True, False]),
+                'noise_level': randint(3, 8),             # Very low noise
+                'adaptive_noise': choice([True, False]),
                 
                 # === PIXEL DISRUPTION ===
-                'blur_radius': random.uniform(0.1, 0.3),         # Minimal blur
-                'blur_variation': random.uniform(0.05, 0.1),     # Blur oscillation
-                'blur_period': random.uniform(30, 90),           # Blur period
-                'channel_mix': {
-                    'rr': random.uniform(0.98, 1.02), 'rg': random.uniform(-0.01, 0.01), 'rb': random.uniform(-0.01, 0.01),
-                    'gr': random.uniform(-0.01, 0.01), 'gg': random.uniform(0.98, 1.02), 'gb': random.uniform(-0.01, 0.01),
-                    'br': random.uniform(-0.01, 0.01), 'bg': random.uniform(-0.01, 0.01), 'bb': random.uniform(0.98, 1.02)
-                },
+                'blur_radius': uniform(0.1, 0.3),         # Minimal blur
+                'blur_variation': uniform(0.05, 0.1),     # Blur oscillation
+                'blur_period': uniform(30, 90),           # Blur period
+                'channel_mix': {key: low + (high - low) * rand() for key, low, high in self._TIKTOK_CHANNEL_MIX},
                 
                 # === REVOLUTIONARY AUDIO ===
-                'sample_rate_adjust': random.choice([44095, 44105, 44110]), # Micro sample rate changes
-                'audio_steganography': random.choice([True, False]),
-                'steg_highpass': random.choice([50, 80, 120]),   # Steganography highpass
-                'steg_lowpass': random.choice([8000, 12000, 16000]), # Steganography lowpass
+                'sample_rate_adjust': choice([44095, 44105, 44110]), # Micro sample rate changes
+                'audio_steganography': choice([True, False]),
                 'eq_bands': [
-                    {'freq': random.choice([440, 880, 1320]), 'gain': random.uniform(-0.1, 0.1), 'width': random.choice([1, 2])},
-                    {'freq': random.choice([2200, 4400, 8800]), 'gain': random.uniform(-0.08, 0.08), 'width': random.choice([1, 2])},
-                    {'freq': random.choice([100, 200, 400]), 'gain': random.uniform(-0.05, 0.05), 'width': random.choice([2, 3])}
+                    {'freq': choice(freqs), 'gain': gain * (2 * rand() - 1), 'width': choice(widths)}
+                    for freqs, gain, widths in self._TIKTOK_EQ_BANDS
                 ],
-                'phase_manipulation': random.choice([True, False]),
-                'phase_in_gain': random.uniform(0.4, 0.6),       # Phase input gain
-                'phase_out_gain': random.uniform(0.7, 0.9),      # Phase output gain
-                'phase_delay': random.uniform(2.0, 4.0),         # Phase delay
-                'phase_decay': random.uniform(0.3, 0.7),         # Phase decay
-                'phase_speed': random.uniform(0.1, 0.5),         # Phase speed
-                'stereo_manipulation': random.choice([True, False]),
-                'stereo_factor': random.uniform(0.98, 1.02),
-                'volume_factor': random.uniform(0.999, 1.001),   # Barely perceptible
-                'insert_silence': random.choice([True, False]),
-                'silence_duration': random.uniform(0.005, 0.02), # Very short silence
-                'silence_position': random.choice(['start', 'middle', 'end']),
-                'compression_artifacts': random.choice([True, False]),
-                'comp_threshold': random.uniform(0.1, 0.3),      # Compressor threshold
-                'comp_ratio': random.uniform(2, 4),              # Compressor ratio
-                'comp_attack': random.uniform(1, 5),             # Compressor attack
-                'comp_release': random.uniform(50, 150),         # Compressor release
+                'phase_manipulation': choice([True, False]),
+                'stereo_manipulation': choice([True, False]),
+                'volume_factor': uniform(0.999, 1.001),   # Barely perceptible
+                'insert_silence': choice([True, False]),
+                'compression_artifacts': choice([True, False]),
                 
                 # === ADVANCED ENCODING PARAMETERS ===
-                'crf': random.randint(20, 24),
-                'encoding_preset': random.choice(['medium', 'slow', 'slower']),
-                'h264_profile': random.choice(['main', 'high']),
-                'h264_level': random.choice(['3.1', '4.0', '4.1']),
-                'pixel_format': random.choice(['yuv420p', 'yuvj420p']),
-                'bitrate': random.choice(['1.8M', '2M', '2.2M']),
-                'audio_bitrate': random.choice(['128k', '160k', '192k']),
+                'crf': randint(20, 24),
+                'encoding_preset': choice(['medium', 'slow', 'slower']),
+                'h264_profile': choice(['main', 'high']),
+                'h264_level': choice(['3.1', '4.0', '4.1']),
+                'pixel_format': choice(['yuv420p', 'yuvj420p']),
+                'bitrate': choice(['1.8M', '2M', '2.2M']),
+                'audio_bitrate': choice(['128k', '160k', '192k']),
                 
                 # === KEYFRAME MANIPULATION ===
-                'keyframe_interval': random.randint(250, 350),   # GOP size
-                'scene_threshold': random.uniform(0.3, 0.5),     # Scene change threshold
-                'min_keyframe_interval': random.randint(10, 25), # Min keyframe interval
+                'keyframe_interval': randint(250, 350),   # GOP size
+                'scene_threshold': uniform(0.3, 0.5),     # Scene change threshold
+                'min_keyframe_interval': randint(10, 25), # Min keyframe interval
                 
                 # === FINAL ENCODING ===
-                'final_crf': random.randint(21, 25),
-                'final_preset': random.choice(['fast', 'medium', 'slow']),
-                'final_profile': random.choice(['main', 'high']),
-                'final_keyframe_interval': random.randint(200, 400),
-                'final_min_keyframe': random.randint(8, 20),
-                'b_frames': random.randint(2, 5),                # B-frame count
-                'ref_frames': random.randint(2, 4),              # Reference frames
+                'final_crf': randint(21, 25),
+                'final_preset': choice(['fast', 'medium', 'slow']),
+                'final_profile': choice(['main', 'high']),
+                'final_keyframe_interval': randint(200, 400),
+                'final_min_keyframe': randint(8, 20),
+                'b_frames': randint(2, 5),                # B-frame count
+                'ref_frames': randint(2, 4),              # Reference frames
                 'fake_creation_time': self._get_random_timestamp()
             }
+            
+            # Parameters of a switchable layer are only drawn when its switch came up True
+            if variation['optical_flow_disruption']:
+                variation.update({
+                    'flow_stepsize': choice([6, 8, 12]),      # Motion detection step size
+                    'flow_smoothing': randint(10, 30),        # Flow smoothing
+                    'flow_maxshift': randint(5, 15),          # Max motion shift
+                    'flow_maxangle': uniform(0.1, 0.3)        # Max rotation angle
+                })
+            if variation['apply_perspective']:
+                variation['perspective'] = {key: low + (high - low) * rand() for key, low, high in self._TIKTOK_PERSPECTIVE}
+            if variation['lens_distortion']:
+                variation.update({
+                    'lens_cx': uniform(0.45, 0.55),           # Lens center X
+                    'lens_cy': uniform(0.45, 0.55),           # Lens center Y
+                    'lens_k1': uniform(-0.05, 0.05),          # Lens distortion k1
+                    'lens_k2': uniform(-0.02, 0.02)           # Lens distortion k2
+                })
+            if variation['audio_steganography']:
+                variation.update({
+                    'steg_highpass': choice([50, 80, 120]),   # Steganography highpass
+                    'steg_lowpass': choice([8000, 12000, 16000])  # Steganography lowpass
+                })
+            if variation['phase_manipulation']:
+                variation.update({
+                    'phase_in_gain': uniform(0.4, 0.6),       # Phase input gain
+                    'phase_out_gain': uniform(0.7, 0.9),      # Phase output gain
+                    'phase_delay': uniform(2.0, 4.0),         # Phase delay
+                    'phase_decay': uniform(0.3, 0.7),         # Phase decay
+                    'phase_speed': uniform(0.1, 0.5)          # Phase speed
+                })
+            if variation['stereo_manipulation']:
+                variation['stereo_factor'] = uniform(0.98, 1.02)
+            if variation['insert_silence']:
+                variation.update({
+                    'silence_duration': uniform(0.005, 0.02), # Very short silence
+                    'silence_position': choice(['start', 'middle', 'end'])
+                })
+            if variation['compression_artifacts']:
+                variation.update({
+                    'comp_threshold': uniform(0.1, 0.3),      # Compressor threshold
+                    'comp_ratio': uniform(2, 4),              # Compressor ratio
+                    'comp_attack': uniform(1, 5),             # Compressor attack
+                    'comp_release': uniform(50, 150)          # Compressor release
+                })
+            return variation
         elif platform == 'instagram':
             return {
                 'speed_factor': random.uniform(0.98, 1.02),
@@ -1702,28 +2067,23 @@ class VideoProcessor:
     
     def _get_random_timestamp(self):
         """Generate a random timestamp for metadata manipulation"""
-        import datetime
         # Generate a timestamp within the last 2 years
-        now = datetime.datetime.now()
-        past = now - datetime.timedelta(days=730)
-        timestamp_range = int((now - past).total_seconds())
-        random_seconds = random.randint(0, timestamp_range)
-        fake_time = past + datetime.timedelta(seconds=random_seconds)
-        return fake_time.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+        fake_time = datetime.datetime.now() - datetime.timedelta(seconds=random.randint(0, _FAKE_TIME_SPAN))
+        return fake_time.isoformat(timespec='microseconds') + 'Z'  # Same text as %Y-%m-%dT%H:%M:%S.%fZ
     
-    def apply_custom_commands(self, input_path, commands):
+    def apply_custom_commands(self, input_path, commands, preset=None):
         """Apply custom commands to video"""
-        output_path = os.path.join(self.temp_dir, f"custom_{Path(input_path).stem}.mp4")
+        output_path = os.path.join(self.temp_dir, f"custom_{_stem(input_path)}.mp4")
         
         try:
-            stream = ffmpeg.input(input_path).video
+            stream = self._input(input_path).video
             
             for command in commands:
                 stream = self._apply_video_command(stream, command)
             
             (
                 stream
-                .output(output_path, acodec='aac', vcodec='libx264', crf=23)
+                .output(output_path, acodec='aac', **self._encoder_params(23, preset))
                 .overwrite_output()
                 .run(quiet=True)
             )
@@ -1748,8 +2108,13 @@ class VideoProcessor:
             return stream.filter('setpts', f'{pts_value}*PTS')
         
         elif cmd_type == 'zoom':
-            zoom_factor = params.get('factor', 1.0)
-            return stream.filter('zoompan', zoom=zoom_factor, x='iw/2-(iw/zoom/2)', y='ih/2-(ih/zoom/2)', d=1)
+            zoom_factor = max(params.get('factor', 1.0), 1.0)  # zoompan clamped zooms below 1 too
+            if zoom_factor == 1.0:
+                return stream
+            # A static centre zoom: one scale and a centred crop back to the input size, instead of
+            # zoompan's per-frame trajectory evaluation (which also forced a 1280x720, 25 fps output)
+            return (stream.filter('scale', f'iw*{zoom_factor}', f'ih*{zoom_factor}')
+                    .filter('crop', f'iw/{zoom_factor}', f'ih/{zoom_factor}'))
         
         elif cmd_type == 'rotate':
             angle = params.get('angle', 0)
@@ -1757,11 +2122,11 @@ class VideoProcessor:
         
         elif cmd_type == 'brightness':
             brightness = params.get('value', 0) / 100.0
-            return stream.filter('eq', brightness=brightness)
+            return self._eq(stream, brightness=brightness)
         
         elif cmd_type == 'contrast':
             contrast = params.get('value', 100) / 100.0
-            return stream.filter('eq', contrast=contrast)
+            return self._eq(stream, contrast=contrast)
         
         elif cmd_type == 'vintage':
             # Apply vintage effect with sepia and grain
@@ -1773,44 +2138,30 @@ class VideoProcessor:
     def _apply_batch_protection(self, variation_seed, platform):
         """Prevent pattern detection across multiple video uploads in the same session"""
         # Create unique fingerprint for this processing session
-        session_fingerprint = {
-            'platform': platform,
-            'variation_type': variation_seed % 8,  # 8 different types for videos
-            'timestamp': int(time.time() / 600)    # 10-minute windows (videos take longer)
-        }
+        variation_type = variation_seed % 8  # 8 different types for videos
+        timestamp = int(time.time() / 600)  # 10-minute windows (videos take longer)
         
         # Check if this combination was used recently
-        recent_similar = [h for h in self.session_history 
-                         if h['platform'] == platform and 
-                         h['variation_type'] == session_fingerprint['variation_type'] and
-                         abs(h['timestamp'] - session_fingerprint['timestamp']) <= 3]
-        
-        # If similar pattern found recently, modify the variation
-        if recent_similar:
+        counts = self._history_counts
+        if any(counts[(platform, variation_type, window)] for window in range(timestamp - 3, timestamp + 4)):
             # Force a different variation type
-            available_types = list(range(8))
-            used_types = [h['variation_type'] for h in recent_similar]
-            available_types = [t for t in available_types if t not in used_types]
-            
-            if available_types:
-                new_type = random.choice(available_types)
-                variation_seed = (variation_seed // 8) * 8 + new_type
-            else:
-                # All types used recently, add random offset
-                variation_seed += random.randint(15, 75)
-        
-        # Add this session to history
-        self.session_history.append(session_fingerprint)
+            new_type = random.choice([t for t in range(8) if t != variation_type])
+            variation_seed = (variation_seed // 8) * 8 + new_type
         
-        # Keep only recent history
-        if len(self.session_history) > self.max_history:
-            self.session_history = self.session_history[-self.max_history:]
+        # Add this session to history, forgetting the fingerprint the deque is about to drop
+        if len(self.session_history) == self.max_history:
+            oldest = self.session_history[0]
+            counts[oldest] -= 1
+            if not counts[oldest]:
+                del counts[oldest]
+        fingerprint = (platform, variation_type, timestamp)
+        self.session_history.append(fingerprint)
+        counts[fingerprint] += 1
         
         return variation_seed
     
     def _generate_fake_timestamp(self):
         """Generate fake but realistic video creation timestamp"""
-        import datetime
         now = datetime.datetime.now()
         random_days_ago = random.randint(1, 90)  # 1-90 days ago
         fake_time = now - datetime.timedelta(days=random_days_ago, 
@@ -1822,7 +2173,7 @@ class VideoProcessor:
     def _validate_audio_in_output(self, file_path):
         """Check if the output file contains audio streams"""
         try:
-            probe = ffmpeg.probe(file_path)
+            probe = self._probe(file_path)
             audio_streams = [stream for stream in probe['streams'] if stream['codec_type'] == 'audio']
             if audio_streams:
                 print(f"✓ Audio validated: {len(audio_streams)} audio stream(s) found")
@@ -1833,3 +2184,20 @@ class VideoProcessor:
         except Exception as e:
             print(f"⚠ Could not validate audio: {e}")
             return False
+
+
+_worker_processor = None
+
+
+def _apply_video_preset_in_worker(input_path, platform, preset=None, threads=None, output_path=None):
+    """Apply a preset with this worker process's own VideoProcessor"""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = VideoProcessor()
+    _worker_processor._threads = threads
+    try:
+        return _worker_processor.apply_preset(input_path, platform, preset, output_path)
+    except Exception:
+        if output_path and os.path.exists(output_path):
+            os.remove(output_path)
+        raise